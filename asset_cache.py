@@ -0,0 +1,140 @@
+import hashlib
+import multiprocessing
+import os
+import struct
+import threading
+import pygame
+from display_format import ingest
+
+# Incrémenter CACHE_VERSION invalide tous les fichiers déjà écrits
+CACHE_VERSION = 1
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '.cache', 'assets')
+HEADER = struct.Struct('<4sHHH4s')  # magic, version, largeur, hauteur, format des pixels
+MAGIC = b'AVPX'
+
+
+def display_pixel_format():
+    """Ordre des octets correspondant au format de l'écran (la conversion devient une simple copie)"""
+    display = pygame.display.get_surface()
+    if display is not None and display.get_bitsize() == 32 and display.get_masks()[0] == 0xFF0000:
+        return 'BGRA'
+    return 'RGBA'
+
+
+def source_digest(path, *params):
+    """Empreinte d'un fichier source (chemin, date, taille) et des paramètres de sa préparation ;
+    OSError si la source n'existe pas"""
+    stat = os.stat(path)
+    key = '|'.join([os.path.abspath(path), *map(str, params), str(stat.st_mtime_ns), str(stat.st_size)])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def cache_path(path, size, alpha, resolution):
+    """Fichier de cache pour (image source, taille, alpha) à cette résolution d'écran"""
+    digest = source_digest(path, f"{size[0]}x{size[1]}", alpha)
+    return os.path.join(CACHE_DIR, f"v{CACHE_VERSION}", f"{resolution[0]}x{resolution[1]}", digest + '.raw')
+
+
+def write_blob(out_path, surface, pixel_format):
+    """True si le fichier est écrit ; un échec est signalé et ne laisse pas de fichier partiel"""
+    data = pygame.image.tostring(surface, pixel_format)
+    width, height = surface.get_size()
+    # Un fichier temporaire par processus et par thread (les threads de l'AssetLoader écrivent aussi)
+    tmp_path = f"{out_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, CACHE_VERSION, width, height, pixel_format.encode('ascii')))
+            f.write(data)
+        os.replace(tmp_path, out_path)  # Écriture atomique (plusieurs processus possibles)
+    except OSError as e:
+        print(f"Warning: écriture du cache {out_path} impossible: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def read_blob(in_path):
+    """Retourne (taille, format, pixels) ou None si le fichier est absent ou d'une autre version"""
+    try:
+        with open(in_path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                return None
+            magic, version, width, height, pixel_format = HEADER.unpack(header)
+            if magic != MAGIC or version != CACHE_VERSION:
+                return None
+            data = f.read()
+    except OSError:
+        return None
+    pixel_format = pixel_format.decode('ascii')
+    if len(data) != width * height * 4:
+        return None
+    return (width, height), pixel_format, data
+
+
+def preprocess_image(job):
+    """Travail d'un processus du pool: décoder, redimensionner et écrire les pixels bruts"""
+    path, size, pixel_format, out_path = job
+    try:
+        surface = pygame.image.load(path)
+        if surface.get_size() != size:
+            surface = pygame.transform.scale(surface, size)
+        return write_blob(out_path, surface, pixel_format)
+    except Exception as e:
+        print(f"Warning: préparation impossible de {path}: {e}")
+        return False
+
+
+def prepare(jobs, resolution, processes=None):
+    """Remplit le cache pour cette résolution en parallèle ; jobs = [(chemin, (w, h), alpha)]"""
+    missing = []
+    for path, size, alpha in jobs:
+        try:
+            out_path = cache_path(path, size, alpha, resolution)
+        except OSError:
+            continue  # Fichier source absent: le chargement normal affichera l'avertissement
+        if not os.path.exists(out_path):
+            missing.append((path, size, display_pixel_format(), out_path))
+    if not missing:
+        return 0
+
+    print(f"Préparation de {len(missing)} images pour {resolution[0]}x{resolution[1]}...")
+    if len(missing) == 1:
+        results = [preprocess_image(missing[0])]
+    else:
+        # 'spawn': un fork après l'initialisation de SDL peut bloquer les processus fils
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(processes or min(len(missing), os.cpu_count() or 1)) as pool:
+            results = pool.map(preprocess_image, missing)
+    return sum(results)
+
+
+def read_image(path, size, alpha=False, resolution=None):
+    """Pixels bruts depuis le cache (sans toucher à pygame.display: utilisable sur un thread)"""
+    out_path = cache_path(path, size, alpha, resolution)  # OSError si la source n'existe pas
+    blob = read_blob(out_path)
+    if blob is None:
+        # Pas encore en cache: préparer ici et garder le résultat pour le prochain lancement
+        if not preprocess_image((path, size, display_pixel_format(), out_path)):
+            raise pygame.error(f"Could not preprocess {path}")
+        blob = read_blob(out_path)
+        if blob is None:
+            raise pygame.error(f"Could not read cached pixels for {path}")
+    return blob
+
+
+def make_surface(blob, alpha=False):
+    """Surface au format de l'écran à partir des pixels lus par read_image (thread principal)"""
+    blob_size, pixel_format, data = blob
+    # Déjà dans l'ordre des octets de l'écran: ingest ne copie que si le format diffère
+    return ingest(pygame.image.frombuffer(data, blob_size, pixel_format), alpha)
+
+
+def load_image(path, size, alpha, resolution):
+    """Surface redimensionnée depuis le cache, sans décodage ni redimensionnement si déjà préparée.
+    `resolution` = taille de la surface de rendu, celle passée à prepare (pas forcément celle de l'écran)"""
+    return make_surface(read_image(path, size, alpha, resolution), alpha)
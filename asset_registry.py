@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from constants import ASSET_MEMORY_BUDGET_MB
+
+CATEGORIES = ('backgrounds', 'video', 'sprites', 'text')
+
+
+def surface_bytes(surface):
+    """Mémoire des pixels d'une surface (une sous-surface partage ceux de son parent)"""
+    if surface is None or surface.get_parent() is not None:
+        return 0
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class AssetEntry:
+    def __init__(self, category, value, nbytes, loader):
+        self.category = category
+        self.value = value
+        self.nbytes = nbytes
+        self.loader = loader  # None = entrée épinglée, jamais évincée
+
+
+class AssetRegistry:
+    """Registre des assets en mémoire: taille de chaque entrée, budget global et éviction LRU"""
+    def __init__(self, budget_mb=ASSET_MEMORY_BUDGET_MB):
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.entries = OrderedDict()  # clé -> AssetEntry, de la moins à la plus récemment utilisée
+        self.category_bytes = {category: 0 for category in CATEGORIES}
+        self.total_bytes = 0
+        self.evicted = set()
+        self.evictions = 0
+        self.reloads = 0
+
+    def get(self, key, category, loader):
+        """Retourne l'asset ; s'il a été évincé (ou jamais chargé), le recharge via loader()"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry.value
+        if key in self.evicted:
+            self.evicted.discard(key)
+            self.reloads += 1
+        value = loader()
+        self.put(key, category, value, loader)
+        return value
+
+    def put(self, key, category, value, loader=None, nbytes=None):
+        """Enregistre un asset déjà chargé ; sans loader il reste épinglé (compté mais jamais évincé)"""
+        self.remove(key)
+        if nbytes is None:
+            nbytes = surface_bytes(value)
+        self.entries[key] = AssetEntry(category, value, nbytes, loader)
+        self.category_bytes[category] = self.category_bytes.get(category, 0) + nbytes
+        self.total_bytes += nbytes
+        self.enforce_budget(keep=key)
+        return value
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.category_bytes[entry.category] -= entry.nbytes
+            self.total_bytes -= entry.nbytes
+        return entry
+
+    def enforce_budget(self, keep=None):
+        """Évince les assets rechargeables les moins récemment utilisés jusqu'à respecter le budget"""
+        if self.total_bytes <= self.budget_bytes:
+            return
+        for key in list(self.entries):
+            if self.total_bytes <= self.budget_bytes:
+                break
+            entry = self.entries[key]
+            if key == keep or entry.loader is None:
+                continue
+            self.remove(key)
+            self.evicted.add(key)
+            self.evictions += 1
+
+    def set_budget(self, budget_mb):
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.enforce_budget()
+
+    def get_report(self):
+        """Mémoire par catégorie (octets) et compteurs d'éviction"""
+        return {
+            'categories': dict(self.category_bytes),
+            'total': self.total_bytes,
+            'budget': self.budget_bytes,
+            'evictions': self.evictions,
+            'reloads': self.reloads
+        }
+
+    def report(self):
+        mb = 1024 * 1024
+        parts = ", ".join(f"{category} {nbytes / mb:.1f} Mo" for category, nbytes in self.category_bytes.items())
+        return (f"Mémoire assets: {self.total_bytes / mb:.1f}/{self.budget_bytes / mb:.0f} Mo ({parts}) - "
+                f"{self.evictions} évictions, {self.reloads} rechargements")
+
+
+asset_registry = AssetRegistry()
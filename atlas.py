@@ -0,0 +1,148 @@
+import json
+import os
+import pygame
+from display_format import ingest
+from asset_registry import asset_registry
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), 'assets')
+ATLAS_IMAGE = os.path.join(ASSETS_DIR, 'atlas.png')
+ATLAS_MANIFEST = os.path.join(ASSETS_DIR, 'atlas.json')
+ATLAS_VERSION = 1
+ATLAS_WIDTH = 1024
+ATLAS_PADDING = 1  # Évite que le filtrage déborde sur le sprite voisin
+
+# Sprites à empaqueter: fichier -> (tailles cibles, variante retournée ?)
+# Les tailles reprennent celles utilisées en jeu (None = taille d'origine)
+ATLAS_SPRITES = {
+    **{f'dragon{i}.png': ([(100, 100), (120, 120), (160, 160)], True) for i in range(1, 7)},
+    'player_idle.png': ([(170, 200)], True),
+    **{f'player_walk_{i}.png': ([(170, 200)], True) for i in range(1, 4)},
+    'projectile_fire.png': ([(24, 24)], False),
+    'Monstre.png': ([None], False),
+}
+
+
+def frame_key(name, size, flipped=False):
+    """Clé d'une frame dans le manifeste: 'dragon1.png@100x100' ou 'Monstre.png@orig' (+ '~flip')"""
+    key = f"{name}@{size[0]}x{size[1]}" if size else f"{name}@orig"
+    return key + '~flip' if flipped else key
+
+
+def build_atlas(assets_dir=ASSETS_DIR, image_path=ATLAS_IMAGE, manifest_path=ATLAS_MANIFEST):
+    """Étape hors-ligne: empaquette les sprites dans une seule image + un manifeste JSON"""
+    frames = []
+    for name, (sizes, with_flip) in ATLAS_SPRITES.items():
+        source = pygame.image.load(os.path.join(assets_dir, name))
+        for size in sizes:
+            scaled = pygame.transform.scale(source, size) if size else source
+            frames.append((frame_key(name, size), scaled))
+            if with_flip:
+                frames.append((frame_key(name, size, True), pygame.transform.flip(scaled, True, False)))
+
+    # Empaquetage par étagères, des plus hautes aux plus petites
+    frames.sort(key=lambda frame: frame[1].get_height(), reverse=True)
+    rects = {}
+    x = y = shelf_height = 0
+    for key, surface in frames:
+        w, h = surface.get_size()
+        if x + w > ATLAS_WIDTH:
+            x = 0
+            y += shelf_height + ATLAS_PADDING
+            shelf_height = 0
+        rects[key] = (x, y, w, h)
+        x += w + ATLAS_PADDING
+        shelf_height = max(shelf_height, h)
+    atlas_height = y + shelf_height
+
+    atlas = pygame.Surface((ATLAS_WIDTH, atlas_height), pygame.SRCALPHA, 32)
+    atlas.fill((0, 0, 0, 0))
+    for key, surface in frames:
+        # BLEND_RGBA_ADD sur un fond nul copie les pixels sans prémultiplier l'alpha
+        atlas.blit(surface, rects[key][:2], special_flags=pygame.BLEND_RGBA_ADD)
+
+    pygame.image.save(atlas, image_path)
+    with open(manifest_path, 'w') as f:
+        json.dump({
+            'version': ATLAS_VERSION,
+            'image': os.path.basename(image_path),
+            'frames': rects
+        }, f, indent=2, sort_keys=True)
+    print(f"✓ Atlas {ATLAS_WIDTH}x{atlas_height}: {len(frames)} frames -> {image_path}")
+
+
+class TextureAtlas:
+    """Chargeur d'atlas: une seule image décodée, les sprites sont des sous-surfaces"""
+    def __init__(self, image_path=ATLAS_IMAGE, manifest_path=ATLAS_MANIFEST):
+        self.image_path = image_path
+        self.manifest_path = manifest_path
+        self.surface = None
+        self.rects = {}
+        self.loaded = False
+        self.available = False
+
+    def read_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != ATLAS_VERSION:
+            print(f"Warning: atlas {self.manifest_path} obsolète, relancer 'python atlas.py'")
+            return None
+        return manifest
+
+    def is_built(self):
+        """Vrai si l'étape de build a produit un atlas à jour (sans le charger)"""
+        return self.available or (not self.loaded and os.path.exists(self.image_path)
+                                  and self.read_manifest() is not None)
+
+    def decode(self):
+        """Lecture du manifeste et décodage de l'image (utilisable sur un thread de chargement)"""
+        manifest = self.read_manifest()
+        if manifest is None:
+            return None
+        try:
+            return manifest, pygame.image.load(self.image_path)
+        except (OSError, pygame.error):
+            return None
+
+    def finish(self, decoded):
+        """Conversion au format de l'écran (thread principal)"""
+        if self.loaded:
+            return  # Déjà chargé à la demande par get()
+        self.loaded = True
+        self.available = False
+        if decoded is None:
+            return
+        manifest, image = decoded
+        try:
+            self.rects = {key: pygame.Rect(rect) for key, rect in manifest['frames'].items()}
+        except (KeyError, TypeError, ValueError):
+            return
+        self.surface = ingest(image, alpha=True)
+        self.available = True
+        # Les sous-surfaces partagent ces pixels: seul l'atlas compte dans le budget
+        asset_registry.put(('atlas', self.image_path), 'sprites', self.surface)
+
+    def load(self):
+        """Charge l'atlas au premier besoin (sans atlas, les fichiers séparés restent utilisés)"""
+        self.finish(self.decode())
+
+    def get(self, path, size=None, flipped=False):
+        """Sous-surface de l'atlas pour ce fichier, ou None si elle n'y est pas"""
+        if not self.loaded:
+            self.load()
+        if not self.available:
+            return None
+
+        rect = self.rects.get(frame_key(os.path.basename(path), size, flipped))
+        if rect is None:
+            return None
+        return self.surface.subsurface(rect)
+
+
+texture_atlas = TextureAtlas()
+
+
+if __name__ == "__main__":
+    build_atlas()
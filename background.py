@@ -0,0 +1,67 @@
+import pygame
+
+
+class BackgroundCompositor:
+    """Couvre l'écran exactement une fois avec le fond, en ne blittant que les zones visibles"""
+    def __init__(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        
+        # Statistiques de la dernière frame (le remplissage ne doit jamais dépasser un écran)
+        self.last_blits = 0
+        self.last_fill_pixels = 0
+    
+    def draw(self, screen, surface, camera_x):
+        """Fond répété horizontalement (image ou frame vidéo) vu depuis camera_x"""
+        tile_width = surface.get_width()
+        height = min(surface.get_height(), self.screen_height)
+        self.last_blits = 0
+        self.last_fill_pixels = 0
+        
+        # Colonne du fond visible au bord gauche de l'écran, puis morceaux jusqu'au bord droit
+        source_x = int(camera_x) % tile_width
+        dest_x = 0
+        while dest_x < self.screen_width:
+            width = min(tile_width - source_x, self.screen_width - dest_x)
+            screen.blit(surface, (dest_x, 0), pygame.Rect(source_x, 0, width, height))
+            self.last_blits += 1
+            self.last_fill_pixels += width * height
+            dest_x += width
+            source_x = 0  # La couture suivante reprend au début du fond
+    
+    def draw_chunks(self, screen, chunks, camera_x, fill_color):
+        """Fond par tronçons: chaque tronçon visible répète sa propre image (None = couleur unie)"""
+        camera_x = int(camera_x)
+        self.last_blits = 0
+        self.last_fill_pixels = 0
+        
+        for chunk_x, chunk_width, surface in chunks:
+            # Partie du tronçon visible à l'écran
+            left = max(chunk_x, camera_x)
+            right = min(chunk_x + chunk_width, camera_x + self.screen_width)
+            if right <= left:
+                continue
+            if surface is None:
+                screen.fill(fill_color, pygame.Rect(left - camera_x, 0, right - left, self.screen_height))
+                self.last_blits += 1
+                self.last_fill_pixels += (right - left) * self.screen_height
+                continue
+            
+            tile_width = surface.get_width()
+            height = min(surface.get_height(), self.screen_height)
+            source_x = (left - chunk_x) % tile_width
+            dest_x = left - camera_x
+            while dest_x < right - camera_x:
+                width = min(tile_width - source_x, right - camera_x - dest_x)
+                screen.blit(surface, (dest_x, 0), pygame.Rect(source_x, 0, width, height))
+                self.last_blits += 1
+                self.last_fill_pixels += width * height
+                dest_x += width
+                source_x = 0
+    
+    def get_stats(self):
+        return {
+            'blits': self.last_blits,
+            'fill_pixels': self.last_fill_pixels,
+            'screen_fraction': self.last_fill_pixels / (self.screen_width * self.screen_height)
+        }
@@ -3,6 +3,41 @@ SCREEN_WIDTH = 1366
 SCREEN_HEIGHT = 768
 FPS = 60
 
+# Résolution interne du rendu, agrandie une fois par frame à l'affichage (None = résolution de l'écran).
+# Par exemple (SCREEN_WIDTH, SCREEN_HEIGHT) sur les écrans 4K des machines modestes.
+RENDER_RESOLUTION = None
+RENDER_SMOOTH_UPSCALE = True  # Agrandissement filtré (False: pixels dupliqués, plus rapide)
+
+# Effets d'écran sur la frame finale (postfx.py), chacun désactivable
+POSTFX_SHAKE = True          # Tremblement quand le joueur est touché
+POSTFX_FLASH = True          # Flash de couleur (coup reçu, attaque spéciale)
+POSTFX_COLOR_GRADE = True    # Teinte de l'image selon l'élément du royaume
+
+# Qualité adaptative (quality.py): paliers plus légers quand les frames dépassent le budget de temps
+QUALITY_ADAPTIVE = True
+
+# Rapports des caches (sprites, mémoire, texte, qualité) affichés dans la console à chaque partie
+DEBUG_REPORTS = False
+
+# Débogage: signaler les surfaces blittées dans un format différent de l'écran (display_format.py)
+FORMAT_AUDIT = False
+
+# Budget mémoire des assets rechargeables (fonds, frames vidéo) avant éviction LRU
+ASSET_MEMORY_BUDGET_MB = 512
+
+# Monde découpé en tronçons d'un écran de large
+KINGDOM_CHUNKS = 2          # Longueur d'un royaume en tronçons
+CHUNK_ACTIVE_MARGIN = 1     # Tronçons actifs (ennemis mis à jour) de part et d'autre de l'écran
+CHUNK_PREFETCH_MARGIN = 2   # Tronçons dont le fond est chargé à l'avance
+
+# Fonds vidéo décodés en continu: frames prêtes gardées d'avance
+VIDEO_BUFFER_FRAMES = 4
+
+# Vidéos transcodées une fois en frames brutes à la résolution de l'écran (video_cache.py), relues par mmap.
+# Taille totale du dossier de cache: les fichiers les moins récemment utilisés sont supprimés au-delà,
+# et une vidéo qui ne tient pas seule dans ce budget reste décodée à la volée.
+VIDEO_CACHE_MAX_MB = 2048
+
 # Couleurs
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
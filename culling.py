@@ -0,0 +1,31 @@
+import pygame
+
+
+class ViewportCuller:
+    """Ne garde que les entités dont la zone dessinée touche l'écran, et compte les autres"""
+    def __init__(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.drawn = {}  # catégorie -> entités dessinées à la dernière frame
+        self.culled = {}  # catégorie -> entités ignorées (hors écran)
+    
+    def begin_frame(self):
+        self.drawn.clear()
+        self.culled.clear()
+    
+    def visible(self, entities, category, camera_x=0, camera_y=0):
+        """Entités visibles ; get_draw_bounds() est en coordonnées monde (écran si caméra à 0)"""
+        # Un pixel de marge: le dessin arrondit les positions avec int()
+        viewport = pygame.Rect(int(camera_x) - 1, int(camera_y) - 1, self.screen_width + 2, self.screen_height + 2)
+        visible = [entity for entity in entities if viewport.colliderect(entity.get_draw_bounds())]
+        self.drawn[category] = self.drawn.get(category, 0) + len(visible)
+        self.culled[category] = self.culled.get(category, 0) + len(entities) - len(visible)
+        return visible
+    
+    def get_stats(self):
+        return {
+            'drawn': dict(self.drawn),
+            'culled': dict(self.culled),
+            'total_drawn': sum(self.drawn.values()),
+            'total_culled': sum(self.culled.values())
+        }
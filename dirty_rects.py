@@ -0,0 +1,84 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """Écrans statiques (boutique, paramètres, game over): seules les zones modifiées sont redessinées et envoyées"""
+    def __init__(self, target):
+        self.target = target  # RenderTarget: envoi à l'écran (avec agrandissement si rendu interne)
+        self.screen = target.surface
+        self.screen_name = None  # Écran affiché en mode dirty-rect à la frame précédente
+        self.used = False  # Un écran a utilisé ce mode pendant la frame
+        self.full_redraw = True
+        self.background = None  # Copie de la couche statique, pour effacer une zone avant de la redessiner
+        self.regions = {}  # clé -> (rect, état) au dernier dessin
+        self.dirty_rects = []
+
+        # Statistiques: frames sans aucun envoi et pixels envoyés à la dernière frame
+        self.idle_frames = 0
+        self.last_pixels = 0
+
+    def begin(self, name):
+        """Début de frame d'un écran statique ; True si la couche statique doit être redessinée"""
+        self.used = True
+        if name != self.screen_name:
+            self.screen_name = name
+            self.full_redraw = True
+        if self.full_redraw:
+            self.regions.clear()
+        return self.full_redraw
+
+    def save_background(self):
+        """À appeler une fois la couche statique dessinée"""
+        if self.background is None or self.background.get_size() != self.screen.get_size():
+            self.background = self.screen.copy()
+        else:
+            self.background.blit(self.screen, (0, 0))
+
+    def changed(self, key, state):
+        """True si la zone doit être redessinée (son ancien contenu est alors effacé)"""
+        previous = self.regions.get(key)
+        if previous is not None and previous[1] == state:
+            return False
+        if previous is not None and previous[0] is not None:
+            self.screen.blit(self.background, previous[0], previous[0])
+            self.dirty_rects.append(previous[0])
+        self.regions[key] = (None, state)
+        return True
+
+    def drawn(self, key, rect):
+        """Enregistre la zone qui vient d'être dessinée pour `key`"""
+        rect = pygame.Rect(rect)
+        self.regions[key] = (rect, self.regions[key][1])
+        self.dirty_rects.append(rect)
+
+    def invalidate(self):
+        """Force un redessin complet (fenêtre ré-exposée, changement de résolution)"""
+        self.full_redraw = True
+
+    def present(self):
+        """Remplace flip() ; False si aucun écran statique n'a été dessiné pendant la frame"""
+        if not self.used:
+            self.screen_name = None
+            return False
+        self.used = False
+        if self.full_redraw:
+            self.target.flip()
+            self.full_redraw = False
+            self.last_pixels = self.screen.get_width() * self.screen.get_height()
+        elif self.dirty_rects:
+            clip = self.screen.get_rect()
+            rects = [rect.clip(clip) for rect in self.dirty_rects]
+            self.target.update(rects)
+            self.last_pixels = sum(rect.width * rect.height for rect in rects)
+        else:
+            self.idle_frames += 1
+            self.last_pixels = 0
+        self.dirty_rects = []
+        return True
+
+    def get_stats(self):
+        return {
+            'screen': self.screen_name,
+            'idle_frames': self.idle_frames,
+            'last_pixels': self.last_pixels
+        }
@@ -0,0 +1,58 @@
+import pygame
+from constants import FORMAT_AUDIT
+
+
+def matches_display(surface):
+    """Vrai si un blit de cette surface vers l'écran se fait sans conversion de format"""
+    display = pygame.display.get_surface()
+    if display is None:
+        return True
+    if surface.get_bitsize() != display.get_bitsize():
+        return False
+    # Mêmes canaux R, G, B ; avec alpha, le masque alpha occupe les bits restants
+    if surface.get_masks()[:3] != display.get_masks()[:3]:
+        return False
+    has_alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+    return not has_alpha or surface.get_masks()[3] != 0
+
+
+def ingest(surface, alpha=None):
+    """Point d'entrée unique: toute surface destinée à l'écran passe au format de l'écran ici"""
+    if pygame.display.get_surface() is None:
+        return surface
+    if alpha is None:
+        alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+    if matches_display(surface) and alpha == bool(surface.get_flags() & pygame.SRCALPHA):
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def new_surface(size, alpha=False):
+    """Surface vide déjà au format de l'écran (overlays, sprites précalculés, frames vidéo)"""
+    if alpha:
+        return ingest(pygame.Surface(size, pygame.SRCALPHA), alpha=True)
+    return ingest(pygame.Surface(size), alpha=False)
+
+
+class FormatAudit:
+    """Signale (une fois par origine) les surfaces blittées dans un format différent de l'écran.
+    Vérifié aux points de blit communs: chaque commande de la RenderQueue (scène de jeu, par couche)
+    et la surface de rendu agrandie par la RenderTarget ; hors de la file, seule la vidéo du menu est vérifiée.
+    Non vérifiés: les écrans dessinés directement sur la surface de rendu (menu, boutique, paramètres,
+    chargement) et ce qui est blitté dans une autre surface avant l'écran (textes du HUD, boîte de dialogue)"""
+    def __init__(self, enabled=FORMAT_AUDIT):
+        self.enabled = enabled
+        self.mismatches = {}  # origine -> (taille, bits, masques)
+
+    def check(self, surface, tag):
+        if not self.enabled or tag in self.mismatches or matches_display(surface):
+            return
+        self.mismatches[tag] = (surface.get_size(), surface.get_bitsize(), surface.get_masks())
+        print(f"Warning: surface '{tag}' {surface.get_size()} blittée en {surface.get_bitsize()} bits "
+              f"(masques {[hex(m) for m in surface.get_masks()]}), conversion à chaque frame")
+
+    def report(self):
+        return dict(self.mismatches)
+
+
+format_audit = FormatAudit()
@@ -2,6 +2,28 @@ import random
 import pygame
 from enums import Element
 from constants import RED, GREEN, BLACK
+from sprites import sprite_cache, sprite_baker, animation_clock
+
+def paint_enemy_fallback(surface, color, size):
+    """Dessin géométrique de secours, centré dans la surface"""
+    center_x = surface.get_width() // 2
+    center_y = surface.get_height() // 2
+    
+    # Corps de l'ennemi
+    pygame.draw.circle(surface, color, (center_x, center_y), size // 2)
+    pygame.draw.circle(surface, BLACK, (center_x, center_y), size // 2, 2)
+    
+    # Yeux méchants
+    eye_y = center_y - 5
+    pygame.draw.circle(surface, RED, (center_x - 8, eye_y), 4)
+    pygame.draw.circle(surface, RED, (center_x + 8, eye_y), 4)
+
+
+def paint_hp_bar(surface, width):
+    """Barre pleine (verte) suivie d'une barre vide (rouge): une zone source de `width` donne tout pourcentage"""
+    surface.fill(GREEN, (0, 0, width, surface.get_height()))
+    surface.fill(RED, (width, 0, width, surface.get_height()))
+
 
 class Enemy:
     def __init__(self, x, y, enemy_type, element, kingdom_index=0, world_width=2732):
@@ -60,19 +82,18 @@ class Enemy:
         else:
             self.color = (80, 50, 100)
         
-        # Charger les sprites de dragon animés
+        # Charger les sprites de dragon animés (frames partagées entre tous les ennemis)
         self.sprites = []
-        self.current_frame = 0
-        self.animation_timer = 0
         self.animation_speed = 8  # Frames entre chaque image d'animation
         try:
-            for i in range(1, 7):  # dragon1.png à dragon6.png
-                sprite = pygame.image.load(f'Assets/dragon{i}.png').convert_alpha()
-                sprite = pygame.transform.scale(sprite, (self.size * 2, self.size * 2))
-                self.sprites.append(sprite)
+            # dragon1.png à dragon6.png
+            self.sprites = sprite_cache.load_frames([f'Assets/dragon{i}.png' for i in range(1, 7)],
+                                                    (self.size * 2, self.size * 2))
             self.has_sprite = True
         except:
             self.has_sprite = False
+        # Décalage de phase pour que les dragons ne battent pas des ailes en même temps
+        self.animation_phase = random.randrange(6 * self.animation_speed)
         
         self.direction = random.choice([0, 1])  # 0=left, 1=right
         self.move_timer = 0
@@ -132,54 +153,43 @@ class Enemy:
         
         # Dessiner le sprite du dragon animé si disponible
         if self.has_sprite and len(self.sprites) > 0:
-            # Mettre à jour l'animation
-            self.animation_timer += 1
-            if self.animation_timer >= self.animation_speed:
-                self.animation_timer = 0
-                self.current_frame = (self.current_frame + 1) % len(self.sprites)
+            # Frame courante d'après l'horloge partagée
+            frame_index = animation_clock.frame_index(len(self.sprites), self.animation_speed, self.animation_phase)
             
-            # Obtenir le sprite actuel
-            current_sprite = self.sprites[self.current_frame]
+            # Variante pré-retournée si l'ennemi va à gauche
+            facing_left = hasattr(self, 'last_dx') and self.last_dx < 0
+            current_sprite = self.sprites.get(frame_index, facing_left)
             
             # Calculer la position centrée
             sprite_x = screen_x + self.width // 2 - current_sprite.get_width() // 2
             sprite_y = screen_y + self.height // 2 - current_sprite.get_height() // 2
             
-            # Retourner le sprite si l'ennemi va à gauche
-            if hasattr(self, 'last_dx') and self.last_dx < 0:
-                sprite_to_draw = pygame.transform.flip(current_sprite, True, False)
-            else:
-                sprite_to_draw = current_sprite
-            
-            screen.blit(sprite_to_draw, (sprite_x, sprite_y))
+            screen.blit(current_sprite, (sprite_x, sprite_y))
         else:
-            # Fallback: dessin géométrique
-            # Corps de l'ennemi
-            pygame.draw.circle(screen, self.color, 
-                             (screen_x + self.width // 2, screen_y + self.height // 2), 
-                             self.size // 2)
-            pygame.draw.circle(screen, BLACK,
-                             (screen_x + self.width // 2, screen_y + self.height // 2),
-                             self.size // 2, 2)
-            
-            # Yeux méchants
-            eye_y = screen_y + self.height // 2 - 5
-            pygame.draw.circle(screen, RED, (screen_x + self.width // 2 - 8, eye_y), 4)
-            pygame.draw.circle(screen, RED, (screen_x + self.width // 2 + 8, eye_y), 4)
+            # Fallback: dessin géométrique, rendu une seule fois par (couleur, taille)
+            half = self.size // 2 + 1
+            sprite = sprite_baker.bake(('enemy', self.color, self.size), (half * 2, half * 2),
+                                       paint_enemy_fallback, self.color, self.size)
+            screen.blit(sprite, (screen_x + self.width // 2 - half, screen_y + self.height // 2 - half))
         
-        # Barre de vie
+        # Barre de vie: un seul blit dans la barre pré-rendue, décalé selon les HP restants
         hp_bar_width = self.size
         hp_bar_height = 5
         hp_percentage = self.hp / self.max_hp
         
-        pygame.draw.rect(screen, RED,
-                       (screen_x, screen_y - 10, hp_bar_width, hp_bar_height))
-        pygame.draw.rect(screen, GREEN,
-                       (screen_x, screen_y - 10, int(hp_bar_width * hp_percentage), hp_bar_height))
+        green_width = min(max(int(hp_bar_width * hp_percentage), 0), hp_bar_width)
+        bar = sprite_baker.bake(('hp_bar', hp_bar_width), (hp_bar_width * 2, hp_bar_height), paint_hp_bar, hp_bar_width)
+        screen.blit(bar, (screen_x, screen_y - 10), pygame.Rect(hp_bar_width - green_width, 0, hp_bar_width, hp_bar_height))
     
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
     
+    def get_draw_bounds(self):
+        """Zone couverte par draw (sprite centré ou dessin de secours + barre de vie)"""
+        half = self.size + 1
+        bounds = pygame.Rect(self.x + self.width // 2 - half, self.y + self.height // 2 - half, half * 2, half * 2)
+        return bounds.union(pygame.Rect(self.x, self.y - 10, self.size, 5))
+    
     def take_damage(self, damage):
         self.hp -= damage
         return self.hp <= 0
@@ -1,6 +1,7 @@
 from enum import Enum
 
 class GameState(Enum):
+    LOADING = "loading"
     MENU = "menu"
     SETTINGS = "settings"
     SHOP = "shop"
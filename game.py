@@ -2,25 +2,50 @@ import pygame
 import sys
 import random
 import math
-import cv2
+import io
 import os
 from constants import *
 from enums import GameState, Element, Direction
 from particles import Particle
-from ui import Button
+from ui import Button, Label
 from player import Player
 from kingdom import Kingdom
 from projectile import SpecialProjectile, MegaProjectile, UltraProjectile
+from sprites import sprite_cache, animation_clock
+from atlas import texture_atlas, ATLAS_SPRITES
+import asset_cache
+from loader import AssetLoader
+from display_format import new_surface, format_audit
+from asset_registry import asset_registry
+from background import BackgroundCompositor
+from culling import ViewportCuller
+from dirty_rects import DirtyRectRenderer
+from hud import HudLayer, ELEMENT_COLORS
+from text import font_registry, text_cache, glyph_text
+from scenes import SceneStack
+from render_queue import RenderQueue
+from render_target import RenderTarget
+import video_cache
+from postfx import PostEffects
+from quality import quality
 
 class Game:
     def __init__(self):
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        self.display = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        # Tout est dessiné dans self.screen: l'écran, ou une surface à la résolution interne
+        self.target = RenderTarget(self.display, RENDER_RESOLUTION, RENDER_SMOOTH_UPSCALE)
+        self.screen = self.target.surface
         pygame.display.set_caption("Avatar : L'Équilibre Perdu")
         self.clock = pygame.time.Clock()
-        self.state = GameState.MENU
+        # Pile de scènes ; écran de chargement tant que les assets du menu ne sont pas prêts
+        self.scenes = SceneStack(self)
+        self.change_state(GameState.LOADING)
+        self.loader = AssetLoader()
+        self.start_when_loaded = False
         
-        # Récupérer la taille réelle de l'écran
+        # Taille de la surface de rendu (polices, interface et fonds sont mis à l'échelle pour elle)
         self.screen_width, self.screen_height = self.screen.get_size()
+        sprite_cache.set_resolution((self.screen_width, self.screen_height))  # Même dossier de cache que prepare_assets
         
         # Calculer le facteur d'échelle (référence: 1366x768)
         self.scale_x = self.screen_width / 1366
@@ -28,28 +53,46 @@ class Game:
         self.scale = min(self.scale_x, self.scale_y)  
         
         # Polices
-        self.title_font = pygame.font.Font(None, int(90 * self.scale))
-        self.subtitle_font = pygame.font.Font(None, int(55 * self.scale))
-        self.text_font = pygame.font.Font(None, int(40 * self.scale))
-        self.small_font = pygame.font.Font(None, int(30 * self.scale))
+        self.title_font = font_registry.get(None, int(90 * self.scale))
+        self.subtitle_font = font_registry.get(None, int(55 * self.scale))
+        self.text_font = font_registry.get(None, int(40 * self.scale))
+        self.small_font = font_registry.get(None, int(30 * self.scale))
         
-        # Animation du menu - Vidéo en arrière-plan
-        video_path = os.path.join(os.path.dirname(__file__), "Assets/Dragon_incrusté_dans_les_montagnes.mp4")
-        self.menu_video = cv2.VideoCapture(video_path)
+        # Animation du menu - Vidéo en arrière-plan (ouverte par l'AssetLoader)
+        self.menu_video = None  # MappedVideo (frames en cache) ou VideoStream (décodage sur un thread)
         
         # Jeu
+        self.background = BackgroundCompositor(self.screen_width, self.screen_height)
+        self.culler = ViewportCuller(self.screen_width, self.screen_height)
+        self.dirty = DirtyRectRenderer(self.target)
+        self.hud = HudLayer(self.screen_width, self.scale, self.small_font)
+        self.render_queue = RenderQueue(self.screen)
+        self.postfx = PostEffects(self.screen)
+        self.postfx.set_enabled('shake', POSTFX_SHAKE)
+        self.postfx.set_enabled('flash', POSTFX_FLASH)
+        self.postfx.set_enabled('grade', POSTFX_COLOR_GRADE)
+        self.postfx.get('grade').trigger()
+        self.apply_quality()
+        self.build_ui()
         self.player = None
         self.camera_x = 0
         self.camera_y = 0
         self.particles = []
         self.projectiles = []
         
-        # Royaumes
+        # Royaumes: (nom, élément, couleur de fond, fond, type de fond)
+        kingdom_specs = [
+            ("Royaume de l'Eau", Element.EAU, (50, 100, 150), "Assets/eau.jpg", 'image'),
+            ("Royaume de la Terre", Element.TERRE, (100, 70, 40), "Assets/background_jungle.png", 'image'),
+            ("Royaume de l'Air", Element.AIR, (135, 206, 235), "Assets/air.jpg", 'image'),
+            ("Royaume du Feu", Element.FEU, (139, 50, 30), "Assets/feu.jpg", 'image')
+        ]
+        
+        # Les fonds sont chargés en arrière-plan par queue_asset_loading
         self.kingdoms = [
-            Kingdom("Royaume de l'Eau", Element.EAU, (50, 100, 150), "Assets/eau.jpg", 'image', self.screen_width, self.screen_height, kingdom_index=0),
-            Kingdom("Royaume de la Terre", Element.TERRE, (100, 70, 40), "Assets/background_jungle.png", 'image', self.screen_width, self.screen_height, kingdom_index=1),
-            Kingdom("Royaume de l'Air", Element.AIR, (135, 206, 235), "Assets/air.jpg", 'image', self.screen_width, self.screen_height, kingdom_index=2),
-            Kingdom("Royaume du Feu", Element.FEU, (139, 50, 30), "Assets/feu.jpg", 'image', self.screen_width, self.screen_height, kingdom_index=3)
+            Kingdom(name, element, bg_color, bg_path, bg_type, self.screen_width, self.screen_height,
+                    kingdom_index=i, load_assets=False)
+            for i, (name, element, bg_color, bg_path, bg_type) in enumerate(kingdom_specs)
         ]
         self.current_kingdom_index = 0
         self.current_kingdom = None
@@ -84,16 +127,195 @@ class Game:
         # Créer le joueur dès le départ (pour la boutique)
         self.player = Player(80, 200)
         
+        # Chargement en arrière-plan: menu d'abord, royaumes ensuite
+        self.queue_asset_loading(kingdom_specs)
+    
+    @property
+    def state(self):
+        return self.scenes.top.state
+    
+    @state.setter
+    def state(self, state):
+        self.change_state(state)
+    
+    def apply_quality(self):
+        """Réglages qui ne sont pas relus à chaque frame (effets d'écran, filtrage de l'agrandissement)"""
+        tier = quality.tier
+        self.postfx.set_enabled('grade', POSTFX_COLOR_GRADE and tier['color_grade'])
+        self.target.smooth = RENDER_SMOOTH_UPSCALE and tier['smooth_upscale']
+    
+    def change_state(self, state):
+        """Passe à l'état demandé via la pile de scènes (overlay ou remplacement)"""
+        self.scenes.change(state)
+    
+    def build_ui(self):
+        """Widgets de tous les écrans, créés une fois (à rappeler si la résolution change)"""
+        center_x = self.screen_width // 2
+        
+        # Menu principal
+        button_width = int(350 * self.scale)
+        button_height = int(75 * self.scale)
+        button_x = center_x - button_width // 2
+        shadow_offset = int(5 * self.scale)
+        self.menu_labels = [
+            Label("AVATAR", self.title_font, (139, 69, 19), (center_x + shadow_offset, int(185 * self.scale))),  # Ombre
+            Label("AVATAR", self.title_font, (255, 215, 0), (center_x, int(180 * self.scale))),
+            Label("Héritier des 4 Mondes", self.subtitle_font, (255, 250, 205), (center_x, int(260 * self.scale)))
+        ]
+        self.menu_ambient = Label("Le destin d'Aelyra repose entre tes mains...", self.small_font, (200, 200, 150),
+                                  (center_x, self.screen_height - int(60 * self.scale)))
+        self.menu_buttons = {
+            'start': Button(button_x, int(340 * self.scale), button_width, button_height,
+                            "Commencer le Jeu", (34, 139, 34), (50, 180, 50), self.scale),
+            'shop': Button(button_x, int(430 * self.scale), button_width, button_height,
+                           "Boutique", (180, 140, 40), (220, 180, 60), self.scale),
+            'settings': Button(button_x, int(520 * self.scale), button_width, button_height,
+                               "Paramètres", (70, 70, 150), (100, 100, 200), self.scale),
+            'quit': Button(button_x, int(610 * self.scale), button_width, button_height,
+                           "Quitter le Jeu", (139, 0, 0), (180, 0, 0), self.scale)
+        }
+        
+        # Boutique (libellés et couleurs des attaques mis à jour selon l'or et les achats)
+        shop_width = int(400 * self.scale)
+        shop_height = int(100 * self.scale)
+        shop_x = center_x - shop_width // 2
+        self.shop_buttons = {
+            'mega': Button(shop_x, int(280 * self.scale), shop_width, shop_height,
+                           "MEGA - 200 Or", (80, 80, 80), (100, 200, 255), self.scale),
+            'ultra': Button(shop_x, int(430 * self.scale), shop_width, shop_height,
+                            "ULTRA - 500 Or", (80, 80, 80), (255, 150, 255), self.scale),
+            'back': Button(int(50 * self.scale), self.screen_height - int(100 * self.scale),
+                           int(200 * self.scale), int(60 * self.scale),
+                           "Retour", (100, 50, 50), (150, 80, 80), self.scale)
+        }
+        
+        # Paramètres: un bouton par action (libellé = touche assignée)
+        key_button_x = center_x + int(50 * self.scale)
+        self.settings_key_buttons = {
+            action_key: Button(key_button_x, int(260 * self.scale) + i * int(80 * self.scale),
+                               int(250 * self.scale), int(60 * self.scale),
+                               "", (50, 50, 100), (80, 80, 150), self.scale)
+            for i, action_key in enumerate(['move_left', 'move_right', 'jump', 'heal'])
+        }
+        bottom_width = int(300 * self.scale)
+        bottom_height = int(70 * self.scale)
+        self.settings_buttons = {
+            'reset': Button(center_x - bottom_width - int(20 * self.scale), self.screen_height - int(100 * self.scale),
+                            bottom_width, bottom_height, "Réinitialiser", (100, 50, 0), (150, 80, 0), self.scale),
+            'back': Button(center_x + int(20 * self.scale), self.screen_height - int(100 * self.scale),
+                           bottom_width, bottom_height, "Retour", (0, 100, 0), (0, 150, 0), self.scale)
+        }
+        
+        # Victoire
+        self.victory_labels = [Label("VICTOIRE !", self.title_font, (255, 215, 0), (center_x, int(180 * self.scale)))]
+        messages = [
+            "Tu as libéré tous les Gardiens !",
+            "L'équilibre est restauré dans Aelyra.",
+            "Le Néant a été vaincu.",
+            "Tu es le véritable Avatar !"
+        ]
+        for i, message in enumerate(messages):
+            self.victory_labels.append(Label(message, self.text_font, WHITE,
+                                             (center_x, int(300 * self.scale) + i * int(55 * self.scale))))
+        self.victory_button = Button(button_x, int(540 * self.scale), button_width, button_height,
+                                     "Retour au Menu", (34, 139, 34), (50, 180, 50), self.scale)
+        
+        # Game over
+        self.game_over_labels = [
+            Label("GAME OVER", self.title_font, RED, (center_x, int(210 * self.scale))),
+            Label("Le Néant a triomphé...", self.text_font, WHITE, (center_x, int(320 * self.scale)))
+        ]
+        self.game_over_buttons = {
+            'retry': Button(button_x, int(420 * self.scale), button_width, button_height,
+                            "Réessayer", (139, 0, 0), (180, 0, 0), self.scale),
+            'menu': Button(button_x, int(520 * self.scale), button_width, button_height,
+                           "Menu Principal", (100, 100, 100), (150, 150, 150), self.scale)
+        }
+        
+        # Boîte de dialogue semi-transparente, bordure comprise (un seul blit)
+        self.dialogue_box = new_surface((self.screen_width - int(150 * self.scale), int(120 * self.scale)), alpha=True)
+        self.dialogue_box.fill((20, 20, 40, 220))
+        pygame.draw.rect(self.dialogue_box, YELLOW, self.dialogue_box.get_rect(), int(3 * self.scale))
+        
+        # Pause (le voile sur le jeu figé est préparé par la scène)
+        self.pause_title = Label("PAUSE", self.title_font, (255, 255, 255), (center_x, int(200 * self.scale)))
+        pause_width = int(400 * self.scale)
+        pause_height = int(80 * self.scale)
+        pause_x = center_x - pause_width // 2
+        self.pause_buttons = {
+            'resume': Button(pause_x, int(350 * self.scale), pause_width, pause_height,
+                             "Reprendre la Partie", (34, 139, 34), (50, 180, 50), self.scale),
+            'menu': Button(pause_x, int(450 * self.scale), pause_width, pause_height,
+                           "Menu Principal", (139, 0, 0), (180, 0, 0), self.scale)
+        }
+    
+    def queue_asset_loading(self, kingdom_specs):
+        """Décodage sur les threads de l'AssetLoader, création des surfaces sur le thread principal"""
+        # Menu: la vidéo de fond suffit pour rendre le menu interactif
+        video_path = os.path.join(os.path.dirname(__file__), "Assets/Dragon_incrusté_dans_les_montagnes.mp4")
+        size = (self.screen_width, self.screen_height)
+        self.loader.submit('menu', 'menu_video', lambda: video_cache.open_video(video_path, size),
+                           lambda video: self.start_menu_video(video_path, video))
+        
+        # Musique: le fichier est lu sur un thread, le mixer démarre sur le thread principal
+        def read_music():
+            with open('Assets/avatar_sound.mp3', 'rb') as f:
+                return f.read()
+        self.loader.submit('audio', 'music', read_music, self.start_music)
+        
+        # Royaumes: préparer le cache disque (pool de processus), puis l'atlas et les fonds
+        self.loader.submit('kingdoms', 'prepare', lambda: self.prepare_assets(kingdom_specs))
+        self.loader.submit('kingdoms', 'atlas', texture_atlas.decode, texture_atlas.finish, after='prepare')
+        for kingdom in self.kingdoms:
+            self.loader.submit('kingdoms', kingdom.name, kingdom.decode_background, kingdom.finish_background,
+                               after='prepare')
+        
+        # Vidéos: transcodées une fois en frames brutes (rien à faire si déjà en cache) ;
+        # personne n'attend ce groupe, la lecture passe au fichier dès qu'il est prêt
+        self.loader.submit('videos', 'menu_video_cache', lambda: video_cache.transcode(video_path, size),
+                           self.use_menu_video_cache, after='menu_video')
+        for kingdom in self.kingdoms:
+            if kingdom.bg_type == 'video':
+                self.loader.submit('videos', f"{kingdom.name}_video_cache", kingdom.transcode_background,
+                                   kingdom.use_video_cache, after=kingdom.name)
+    
+    def start_menu_video(self, video_path, video):
+        # Frames en cache (mmap) si le fichier existe, sinon décodage sur un thread
+        self.menu_video = video_cache.make_stream(video_path, (self.screen_width, self.screen_height), video)
+        self.menu_video.start()
+    
+    def use_menu_video_cache(self, video):
+        self.menu_video = video_cache.use_cached(self.menu_video, video)
+    
+    def start_music(self, data):
         # Initialiser et lancer la musique de fond
         try:
             pygame.mixer.init()
-            pygame.mixer.music.load('Assets/avatar_sound.mp3')
+            pygame.mixer.music.load(io.BytesIO(data), 'mp3')
             pygame.mixer.music.set_volume(self.music_volume)
             pygame.mixer.music.play(-1)  # -1 = boucle infinie
         except Exception as e:
             print(f"Erreur lors du chargement de la musique: {e}")
     
+    def prepare_assets(self, kingdom_specs):
+        """Remplit le cache disque des images redimensionnées (rien à faire si déjà préparé)"""
+        jobs = [(bg_path, (self.screen_width, self.screen_height), False)
+                for _, _, _, bg_path, bg_type in kingdom_specs if bg_type == 'image']
+        
+        # Les sprites empaquetés dans l'atlas n'ont pas besoin d'être préparés
+        if not texture_atlas.is_built():
+            for name, (sizes, _) in ATLAS_SPRITES.items():
+                jobs.extend((os.path.join('Assets', name), size, True) for size in sizes if size)
+        
+        asset_cache.prepare(jobs, (self.screen_width, self.screen_height))
+    
     def start_game(self):
+        # Les royaumes finissent de se charger en arrière-plan: attendre sur l'écran de chargement
+        if not self.loader.is_ready('kingdoms'):
+            self.start_when_loaded = True
+            self.state = GameState.LOADING
+            return
+        
         # Si c'est la première partie ou si le joueur n'existe pas, créer un nouveau joueur
         if self.player is None:
             self.player = Player(80, 200)
@@ -102,13 +324,28 @@ class Game:
             self.player.reset_position_and_health(80, 200)
         
         # Réinitialiser tous les royaumes pour une nouvelle partie
+        restart = self.current_kingdom is not None
+        disk_loads_before = sprite_cache.disk_loads
         for kingdom in self.kingdoms:
             kingdom.completed = False
             kingdom.generate_world()  # Régénère les ennemis
         
+        # Les sprites viennent du cache partagé : un redémarrage ne doit rien relire sur le disque
+        new_loads = sprite_cache.disk_loads - disk_loads_before
+        if DEBUG_REPORTS or (restart and new_loads):
+            print(f"{sprite_cache.report()} - {new_loads} nouveaux chargements")
+        if DEBUG_REPORTS:
+            print(asset_registry.report())
+            print(text_cache.report())
+        
         # Réinitialiser l'index du royaume au début
         self.current_kingdom_index = 0
         
+        # La vidéo du menu n'est plus affichée: libérer son thread (elle reprend au retour au menu)
+        if self.menu_video is not None:
+            self.menu_video.stop()
+        if self.current_kingdom is not None:
+            self.current_kingdom.stop_video()
         self.current_kingdom = self.kingdoms[self.current_kingdom_index]
         self.camera_x = 0
         self.camera_y = 0
@@ -126,7 +363,7 @@ class Game:
         # Caméra suit le joueur horizontalement avec mouvement fluide
         target_x = self.player.x - self.screen_width // 3
         
-        # Limiter la caméra aux bords du monde (2 écrans)
+        # Limiter la caméra aux bords du monde
         world_width = self.current_kingdom.world_width
         target_x = max(0, min(target_x, world_width - self.screen_width))
         
@@ -135,101 +372,80 @@ class Game:
         self.camera_y = 0
     
     def create_particles(self, x, y, color, count=15):
+        # Moins de particules sur les paliers de qualité légers
+        count = max(1, round(count * quality.tier['particle_scale']))
         for _ in range(count):
             angle = random.uniform(0, 2 * math.pi)
             speed = random.uniform(3, 8)
             velocity = (math.cos(angle) * speed, math.sin(angle) * speed)
             self.particles.append(Particle(x, y, color, velocity))
     
-    def draw_menu(self):
-        # Lire et afficher la vidéo en arrière-plan
-        ret, frame = self.menu_video.read()
-        
-        # Si la vidéo est terminée, recommencer au début
-        if not ret:
-            self.menu_video.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            ret, frame = self.menu_video.read()
-        
-        if ret:
-            # Convertir le frame OpenCV (BGR) en format Pygame (RGB)
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Obtenir les dimensions de la vidéo
-            video_height, video_width = frame.shape[:2]
-            
-            # Calculer les ratios pour remplir l'écran (mode "cover")
-            scale_width = self.screen_width / video_width
-            scale_height = self.screen_height / video_height
-            scale = max(scale_width, scale_height)  # Utiliser le plus grand pour couvrir tout l'écran
-            
-            # Nouvelles dimensions après scaling
-            new_width = int(video_width * scale)
-            new_height = int(video_height * scale)
-            
-            # Redimensionner la vidéo
-            frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
-            
-            # Calculer les offsets pour centrer et cropper
-            x_offset = (new_width - self.screen_width) // 2
-            y_offset = (new_height - self.screen_height) // 2
-            
-            # Cropper la partie centrale pour qu'elle corresponde exactement à la taille de l'écran
-            frame = frame[y_offset:y_offset + self.screen_height, x_offset:x_offset + self.screen_width]
-            
-            # Convertir en surface Pygame
-            frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-            self.screen.blit(frame_surface, (0, 0))
+    def draw_loading(self):
+        """Écran de progression pendant le chargement en arrière-plan"""
+        # Le menu attend ses propres assets ; lancer une partie attend tout le reste
+        group = 'kingdoms' if self.start_when_loaded else 'menu'
+        if self.loader.is_ready(group):
+            if self.start_when_loaded:
+                self.start_when_loaded = False
+                self.start_game()
+            else:
+                self.state = GameState.MENU
+            return
         
-        # Titre
-        title_text = self.title_font.render("AVATAR", True, (255, 215, 0))
-        title_rect = title_text.get_rect(center=(self.screen_width // 2, int(180 * self.scale)))
+        self.screen.fill((20, 20, 40))
         
-        # Ombre du titre
-        shadow_text = self.title_font.render("AVATAR", True, (139, 69, 19))
-        shadow_offset = int(5 * self.scale)
-        shadow_rect = shadow_text.get_rect(center=(self.screen_width // 2 + shadow_offset, int(185 * self.scale)))
-        self.screen.blit(shadow_text, shadow_rect)
+        title_text = text_cache.render(self.title_font, "AVATAR", (255, 215, 0))
+        title_rect = title_text.get_rect(center=(self.screen_width // 2, int(300 * self.scale)))
         self.screen.blit(title_text, title_rect)
         
-        # Sous-titre
-        subtitle_text = self.subtitle_font.render("Héritier des 4 Mondes", True, (255, 250, 205))
-        subtitle_rect = subtitle_text.get_rect(center=(self.screen_width // 2, int(260 * self.scale)))
-        self.screen.blit(subtitle_text, subtitle_rect)
+        # Barre de progression
+        progress = self.loader.progress(group)
+        bar_width = int(500 * self.scale)
+        bar_height = int(24 * self.scale)
+        bar_x = self.screen_width // 2 - bar_width // 2
+        bar_y = int(420 * self.scale)
+        pygame.draw.rect(self.screen, (0, 0, 0), (bar_x - 2, bar_y - 2, bar_width + 4, bar_height + 4))
+        pygame.draw.rect(self.screen, (180, 150, 50), (bar_x - 2, bar_y - 2, bar_width + 4, bar_height + 4), 2)
+        pygame.draw.rect(self.screen, (255, 200, 50), (bar_x, bar_y, int(bar_width * progress), bar_height))
+        
+        loading_text = text_cache.render(self.small_font, f"Chargement... {int(progress * 100)}%", (200, 200, 150))
+        loading_rect = loading_text.get_rect(center=(self.screen_width // 2, bar_y + bar_height + int(40 * self.scale)))
+        self.screen.blit(loading_text, loading_rect)
+    
+    def draw_menu(self):
+        # Vidéo en arrière-plan: décodée, convertie et mise à l'échelle sur un thread, une frame = un blit
+        frame = None
+        if self.menu_video is not None:
+            # Vidéo illisible: start() ne relance rien et get_frame() libère ses tampons puis retourne None
+            self.menu_video.frame_step = quality.tier['video_frame_step']
+            self.menu_video.start()
+            frame = self.menu_video.get_frame()
+        
+        if frame is not None:
+            format_audit.check(frame, 'menu_video')
+            self.screen.blit(frame, (0, 0))
+        else:
+            self.screen.fill((20, 20, 40))
+        
+        # Titre (avec son ombre) et sous-titre
+        for label in self.menu_labels:
+            label.draw(self.screen)
         
         # Boutons
-        button_width = int(350 * self.scale)
-        button_height = int(75 * self.scale)
-        start_button = Button(self.screen_width // 2 - button_width // 2, int(340 * self.scale), 
-                            button_width, button_height, 
-                            "Commencer le Jeu", (34, 139, 34), (50, 180, 50), self.scale)
-        shop_button = Button(self.screen_width // 2 - button_width // 2, int(430 * self.scale), 
-                           button_width, button_height,
-                           "Boutique", (180, 140, 40), (220, 180, 60), self.scale)
-        settings_button = Button(self.screen_width // 2 - button_width // 2, int(520 * self.scale), 
-                               button_width, button_height,
-                               "Paramètres", (70, 70, 150), (100, 100, 200), self.scale)
-        quit_button = Button(self.screen_width // 2 - button_width // 2, int(610 * self.scale), 
-                           button_width, button_height,
-                           "Quitter le Jeu", (139, 0, 0), (180, 0, 0), self.scale)
-        
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.target.mouse_pos()
         mouse_pressed = pygame.mouse.get_pressed()
         
-        start_button.check_hover(mouse_pos)
-        shop_button.check_hover(mouse_pos)
-        settings_button.check_hover(mouse_pos)
-        quit_button.check_hover(mouse_pos)
-        
-        start_button.draw(self.screen)
-        shop_button.draw(self.screen)
-        settings_button.draw(self.screen)
-        quit_button.draw(self.screen)
+        for button in self.menu_buttons.values():
+            button.check_hover(mouse_pos)
+            button.draw(self.screen)
         
         # Texte d'ambiance
-        ambient_text = self.small_font.render("Le destin d'Aelyra repose entre tes mains...", True, (200, 200, 150))
-        ambient_rect = ambient_text.get_rect(center=(self.screen_width // 2, self.screen_height - int(60 * self.scale)))
-        self.screen.blit(ambient_text, ambient_rect)
+        self.menu_ambient.draw(self.screen)
         
+        start_button = self.menu_buttons['start']
+        shop_button = self.menu_buttons['shop']
+        settings_button = self.menu_buttons['settings']
+        quit_button = self.menu_buttons['quit']
         if start_button.is_clicked(mouse_pos, mouse_pressed) and self.click_cooldown == 0:
             self.click_cooldown = 10
             self.start_game()
@@ -244,74 +460,81 @@ class Game:
         
         if quit_button.is_clicked(mouse_pos, mouse_pressed) and self.click_cooldown == 0:
             self.click_cooldown = 10
-            pygame.quit()
-            sys.exit()
+            # Même sortie que la fermeture de la fenêtre: run() arrête transcodages, chargements et vidéos
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
     
     def draw_shop(self):
-        # Fond
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.set_alpha(240)
-        overlay.fill((30, 25, 20))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Titre
-        title_text = self.title_font.render("BOUTIQUE", True, (255, 215, 0))
-        title_rect = title_text.get_rect(center=(self.screen_width // 2, int(80 * self.scale)))
-        self.screen.blit(title_text, title_rect)
+        # Écran statique: fond et titre une seule fois, puis seulement les zones modifiées
+        if self.dirty.begin('shop'):
+            # Fond (état stable de l'ancien voile à 240 répété chaque frame)
+            self.screen.fill((30, 25, 20))
+            
+            # Titre
+            title_text = text_cache.render(self.title_font, "BOUTIQUE", (255, 215, 0))
+            title_rect = title_text.get_rect(center=(self.screen_width // 2, int(80 * self.scale)))
+            self.screen.blit(title_text, title_rect)
+            self.dirty.save_background()
         
         # Or du joueur
-        gold_text = self.text_font.render(f"Votre Or: {self.player.gold}", True, (255, 215, 0))
-        gold_rect = gold_text.get_rect(center=(self.screen_width // 2, int(150 * self.scale)))
-        self.screen.blit(gold_text, gold_rect)
+        if self.dirty.changed('gold', self.player.gold):
+            # Libellé en cache, montant en glyphes (aucune surface créée quand l'or change)
+            gold_label = text_cache.render(self.text_font, "Votre Or: ", (255, 215, 0))
+            gold_glyphs = glyph_text.get(self.text_font, (255, 215, 0))
+            amount = str(self.player.gold)
+            width = gold_label.get_width() + gold_glyphs.size(amount)[0]
+            gold_rect = pygame.Rect(0, 0, width, max(gold_label.get_height(), gold_glyphs.height))
+            gold_rect.center = (self.screen_width // 2, int(150 * self.scale))
+            self.screen.blit(gold_label, gold_rect.topleft)
+            gold_glyphs.draw(self.screen, amount, (gold_rect.x + gold_label.get_width(), gold_rect.y))
+            self.dirty.drawn('gold', gold_rect)
         
         # Attaque actuelle
-        attack_names = ["Boule de Base", "Attaque Mega", "Attaque Ultra"]
-        current_name = attack_names[self.player.special_attack_type]
-        current_text = self.small_font.render(f"Attaque actuelle: {current_name}", True, (200, 200, 200))
-        current_rect = current_text.get_rect(center=(self.screen_width // 2, int(200 * self.scale)))
-        self.screen.blit(current_text, current_rect)
-        
-        mouse_pos = pygame.mouse.get_pos()
+        if self.dirty.changed('attack', self.player.special_attack_type):
+            attack_names = ["Boule de Base", "Attaque Mega", "Attaque Ultra"]
+            current_name = attack_names[self.player.special_attack_type]
+            current_text = text_cache.render(self.small_font, f"Attaque actuelle: {current_name}", (200, 200, 200))
+            current_rect = current_text.get_rect(center=(self.screen_width // 2, int(200 * self.scale)))
+            self.screen.blit(current_text, current_rect)
+            self.dirty.drawn('attack', current_rect)
+        
+        mouse_pos = self.target.mouse_pos()
         mouse_pressed = pygame.mouse.get_pressed()
         
-        button_width = int(400 * self.scale)
-        button_height = int(100 * self.scale)
-        center_x = self.screen_width // 2 - button_width // 2
-        
         # Bouton Mega (200 or)
-        mega_y = int(280 * self.scale)
+        mega_button = self.shop_buttons['mega']
         mega_owned = self.player.special_attack_type >= 1
         mega_color = (50, 100, 50) if mega_owned else ((0, 150, 200) if self.player.gold >= 200 else (80, 80, 80))
         mega_label = "MEGA [POSSEDE]" if mega_owned else "MEGA - 200 Or"
-        mega_button = Button(center_x, mega_y, button_width, button_height, mega_label, mega_color, (100, 200, 255), self.scale)
-        mega_button.check_hover(mouse_pos)
-        mega_button.draw(self.screen)
+        mega_button.set_text(mega_label)
+        mega_button.set_colors(mega_color, (100, 200, 255))
+        self.draw_dirty_button('mega', mega_button, mouse_pos)
         
         # Description Mega
-        if not mega_owned:
-            mega_desc = self.small_font.render("Etoile rotative - 250 degats - Effet cyan", True, (150, 200, 255))
-            self.screen.blit(mega_desc, (center_x, mega_y + button_height + int(5 * self.scale)))
+        if self.dirty.changed('mega_desc', mega_owned) and not mega_owned:
+            mega_desc = text_cache.render(self.small_font, "Etoile rotative - 250 degats - Effet cyan", (150, 200, 255))
+            desc_pos = (mega_button.rect.x, mega_button.rect.bottom + int(5 * self.scale))
+            self.screen.blit(mega_desc, desc_pos)
+            self.dirty.drawn('mega_desc', mega_desc.get_rect(topleft=desc_pos))
         
         # Bouton Ultra (500 or)
-        ultra_y = int(430 * self.scale)
+        ultra_button = self.shop_buttons['ultra']
         ultra_owned = self.player.special_attack_type >= 2
         ultra_color = (50, 100, 50) if ultra_owned else ((200, 50, 200) if self.player.gold >= 500 else (80, 80, 80))
         ultra_label = "ULTRA [POSSEDE]" if ultra_owned else "ULTRA - 500 Or"
-        ultra_button = Button(center_x, ultra_y, button_width, button_height, ultra_label, ultra_color, (255, 150, 255), self.scale)
-        ultra_button.check_hover(mouse_pos)
-        ultra_button.draw(self.screen)
+        ultra_button.set_text(ultra_label)
+        ultra_button.set_colors(ultra_color, (255, 150, 255))
+        self.draw_dirty_button('ultra', ultra_button, mouse_pos)
         
         # Description Ultra
-        if not ultra_owned:
-            ultra_desc = self.small_font.render("Anneaux cosmiques - 500 degats - Arc-en-ciel", True, (255, 150, 255))
-            self.screen.blit(ultra_desc, (center_x, ultra_y + button_height + int(5 * self.scale)))
+        if self.dirty.changed('ultra_desc', ultra_owned) and not ultra_owned:
+            ultra_desc = text_cache.render(self.small_font, "Anneaux cosmiques - 500 degats - Arc-en-ciel", (255, 150, 255))
+            desc_pos = (ultra_button.rect.x, ultra_button.rect.bottom + int(5 * self.scale))
+            self.screen.blit(ultra_desc, desc_pos)
+            self.dirty.drawn('ultra_desc', ultra_desc.get_rect(topleft=desc_pos))
         
         # Bouton Retour
-        back_button = Button(int(50 * self.scale), self.screen_height - int(100 * self.scale), 
-                            int(200 * self.scale), int(60 * self.scale),
-                            "Retour", (100, 50, 50), (150, 80, 80), self.scale)
-        back_button.check_hover(mouse_pos)
-        back_button.draw(self.screen)
+        back_button = self.shop_buttons['back']
+        self.draw_dirty_button('back', back_button, mouse_pos)
         
         # Gestion des clics
         if mega_button.is_clicked(mouse_pos, mouse_pressed) and not mega_owned and self.player.gold >= 200 and self.click_cooldown == 0:
@@ -328,24 +551,14 @@ class Game:
             self.click_cooldown = 10
             self.state = GameState.MENU
     
+    def draw_dirty_button(self, key, button, mouse_pos):
+        """Survol mis à jour à chaque frame, bouton redessiné seulement si son aspect change"""
+        hovered = button.check_hover(mouse_pos)
+        if self.dirty.changed(key, (button.text, button.color, button.hover_color, hovered)):
+            self.dirty.drawn(key, button.draw(self.screen))
+    
     def draw_settings(self):
-        # Fond semi-transparent
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.set_alpha(230)
-        overlay.fill((20, 20, 40))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Titre
-        title_text = self.title_font.render("PARAMÈTRES", True, (255, 215, 0))
-        title_rect = title_text.get_rect(center=(self.screen_width // 2, int(100 * self.scale)))
-        self.screen.blit(title_text, title_rect)
-        
-        # Sous-titre
-        subtitle_text = self.text_font.render("Configuration des touches", True, (200, 200, 200))
-        subtitle_rect = subtitle_text.get_rect(center=(self.screen_width // 2, int(180 * self.scale)))
-        self.screen.blit(subtitle_text, subtitle_rect)
-        
-        # Actions et leurs touches
+        # Écran statique: fond, titres et noms des actions une seule fois
         actions = {
             'move_left': 'Déplacer à gauche',
             'move_right': 'Déplacer à droite',
@@ -355,20 +568,38 @@ class Game:
         
         y_start = int(260 * self.scale)
         y_spacing = int(80 * self.scale)
-        button_width = int(250 * self.scale)
-        button_height = int(60 * self.scale)
+        volume_y = y_start + len(actions) * y_spacing + int(10 * self.scale)
+        
+        if self.dirty.begin('settings'):
+            # Fond (état stable de l'ancien voile à 230 répété chaque frame)
+            self.screen.fill((20, 20, 40))
+            
+            # Titre
+            title_text = text_cache.render(self.title_font, "PARAMÈTRES", (255, 215, 0))
+            title_rect = title_text.get_rect(center=(self.screen_width // 2, int(100 * self.scale)))
+            self.screen.blit(title_text, title_rect)
+            
+            # Sous-titre
+            subtitle_text = text_cache.render(self.text_font, "Configuration des touches", (200, 200, 200))
+            subtitle_rect = subtitle_text.get_rect(center=(self.screen_width // 2, int(180 * self.scale)))
+            self.screen.blit(subtitle_text, subtitle_rect)
+            
+            # Nom de chaque action
+            for i, action_name in enumerate(actions.values()):
+                y_pos = y_start + i * y_spacing
+                action_text = text_cache.render(self.text_font, action_name + ":", WHITE)
+                self.screen.blit(action_text, (int(150 * self.scale), y_pos + int(15 * self.scale)))
+            
+            # Titre de la section volume
+            volume_title = text_cache.render(self.text_font, "Volume Musique:", WHITE)
+            self.screen.blit(volume_title, (int(150 * self.scale), volume_y))
+            self.dirty.save_background()
         
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.target.mouse_pos()
         mouse_pressed = pygame.mouse.get_pressed()
         
         # Afficher chaque action avec sa touche
-        for i, (action_key, action_name) in enumerate(actions.items()):
-            y_pos = y_start + i * y_spacing
-            
-            # Nom de l'action
-            action_text = self.text_font.render(action_name + ":", True, WHITE)
-            self.screen.blit(action_text, (int(150 * self.scale), y_pos + int(15 * self.scale)))
-            
+        for action_key in actions:
             # Obtenir le nom de la touche
             keys = self.keybindings.get(action_key, [])
             if keys:
@@ -379,50 +610,49 @@ class Game:
                 key_name = "Non assigné"
             
             # Bouton pour changer la touche
-            key_button_x = self.screen_width // 2 + int(50 * self.scale)
+            key_button = self.settings_key_buttons[action_key]
             if self.waiting_for_key and self.selected_action == action_key:
-                key_button = Button(key_button_x, y_pos, button_width, button_height,
-                                  "Appuyez sur une touche...", (100, 100, 0), (130, 130, 0), self.scale)
+                key_button.set_text("Appuyez sur une touche...")
+                key_button.set_colors((100, 100, 0), (130, 130, 0))
             else:
-                key_button = Button(key_button_x, y_pos, button_width, button_height,
-                                  key_name, (50, 50, 100), (80, 80, 150), self.scale)
+                key_button.set_text(key_name)
+                key_button.set_colors((50, 50, 100), (80, 80, 150))
             
-            key_button.check_hover(mouse_pos)
-            key_button.draw(self.screen)
+            self.draw_dirty_button(action_key, key_button, mouse_pos)
             
             # Si on clique sur le bouton, on attend une nouvelle touche
             if key_button.is_clicked(mouse_pos, mouse_pressed) and not self.waiting_for_key:
                 self.waiting_for_key = True
                 self.selected_action = action_key
         # === SECTION VOLUME ===
-        # Positionner le slider de volume entre les touches et les boutons
-        volume_y = y_start + len(actions) * y_spacing + int(10 * self.scale)
-        
-        # Titre de la section
-        volume_title = self.text_font.render("Volume Musique:", True, WHITE)
-        self.screen.blit(volume_title, (int(150 * self.scale), volume_y))
-        
-        # Barre de volume (slider)
+        # Barre de volume (slider), entre les touches et les boutons
         slider_x = self.screen_width // 2 + int(50 * self.scale)
         slider_width = int(250 * self.scale)
         slider_height = int(20 * self.scale)
         slider_y = volume_y + int(5 * self.scale)
         
-        # Fond de la barre
-        pygame.draw.rect(self.screen, (60, 60, 60), (slider_x, slider_y, slider_width, slider_height))
-        pygame.draw.rect(self.screen, (100, 100, 100), (slider_x, slider_y, slider_width, slider_height), 2)
-        
-        # Barre de volume remplie
-        fill_width = int(slider_width * self.music_volume)
-        pygame.draw.rect(self.screen, (50, 200, 50), (slider_x, slider_y, fill_width, slider_height))
-        
-        # Curseur du slider
-        cursor_x = slider_x + fill_width - int(5 * self.scale)
-        pygame.draw.rect(self.screen, (255, 255, 255), (cursor_x, slider_y - int(3 * self.scale), int(10 * self.scale), slider_height + int(6 * self.scale)))
-        
-        # Pourcentage affiché
-        volume_percent = self.small_font.render(f"{int(self.music_volume * 100)}%", True, (200, 200, 200))
-        self.screen.blit(volume_percent, (slider_x + slider_width + int(15 * self.scale), volume_y))
+        if self.dirty.changed('volume', self.music_volume):
+            # Fond de la barre
+            pygame.draw.rect(self.screen, (60, 60, 60), (slider_x, slider_y, slider_width, slider_height))
+            pygame.draw.rect(self.screen, (100, 100, 100), (slider_x, slider_y, slider_width, slider_height), 2)
+            
+            # Barre de volume remplie
+            fill_width = int(slider_width * self.music_volume)
+            pygame.draw.rect(self.screen, (50, 200, 50), (slider_x, slider_y, fill_width, slider_height))
+            
+            # Curseur du slider
+            cursor_x = slider_x + fill_width - int(5 * self.scale)
+            cursor_rect = pygame.Rect(cursor_x, slider_y - int(3 * self.scale), int(10 * self.scale), slider_height + int(6 * self.scale))
+            pygame.draw.rect(self.screen, (255, 255, 255), cursor_rect)
+            
+            # Pourcentage affiché
+            volume_percent = text_cache.render(self.small_font, f"{int(self.music_volume * 100)}%", (200, 200, 200))
+            percent_pos = (slider_x + slider_width + int(15 * self.scale), volume_y)
+            self.screen.blit(volume_percent, percent_pos)
+            
+            # Le curseur déborde de la barre: la zone couvre barre, curseur et pourcentage
+            volume_rect = pygame.Rect(slider_x, slider_y, slider_width, slider_height).union(cursor_rect)
+            self.dirty.drawn('volume', volume_rect.union(volume_percent.get_rect(topleft=percent_pos)))
         
         # Interaction avec le slider
         slider_rect = pygame.Rect(slider_x, slider_y - int(5 * self.scale), slider_width, slider_height + int(10 * self.scale))
@@ -433,31 +663,24 @@ class Game:
             pygame.mixer.music.set_volume(self.music_volume)
         
         # Boutons en bas - positionnés plus bas pour éviter le chevauchement
-        button_width_bottom = int(300 * self.scale)
-        button_height_bottom = int(70 * self.scale)
-        
-        reset_button = Button(self.screen_width // 2 - button_width_bottom - int(20 * self.scale), 
-                             self.screen_height - int(100 * self.scale),
-                             button_width_bottom, button_height_bottom,
-                             "Réinitialiser", (100, 50, 0), (150, 80, 0), self.scale)
-        
-        back_button = Button(self.screen_width // 2 + int(20 * self.scale), 
-                            self.screen_height - int(100 * self.scale),
-                            button_width_bottom, button_height_bottom,
-                            "Retour", (0, 100, 0), (0, 150, 0), self.scale)
+        reset_button = self.settings_buttons['reset']
+        back_button = self.settings_buttons['back']
         
-        reset_button.check_hover(mouse_pos)
-        back_button.check_hover(mouse_pos)
+        reset_hovered = reset_button.check_hover(mouse_pos)
+        back_hovered = back_button.check_hover(mouse_pos)
         
-        reset_button.draw(self.screen)
-        back_button.draw(self.screen)
-        
-        # Instructions si on attend une touche
-        if self.waiting_for_key:
-            instruction_text = self.small_font.render("Appuyez sur ESC pour annuler", True, YELLOW)
-            instruction_rect = instruction_text.get_rect(center=(self.screen_width // 2, 
-                                                                 self.screen_height - int(50 * self.scale)))
-            self.screen.blit(instruction_text, instruction_rect)
+        # Les instructions chevauchent les boutons: une seule zone, dessinée dans le même ordre
+        if self.dirty.changed('bottom', (reset_hovered, back_hovered, self.waiting_for_key)):
+            bottom_rect = reset_button.draw(self.screen).union(back_button.draw(self.screen))
+            
+            # Instructions si on attend une touche
+            if self.waiting_for_key:
+                instruction_text = text_cache.render(self.small_font, "Appuyez sur ESC pour annuler", YELLOW)
+                instruction_rect = instruction_text.get_rect(center=(self.screen_width // 2, 
+                                                                     self.screen_height - int(50 * self.scale)))
+                self.screen.blit(instruction_text, instruction_rect)
+                bottom_rect.union_ip(instruction_rect)
+            self.dirty.drawn('bottom', bottom_rect)
         
         # Actions des boutons
         if reset_button.is_clicked(mouse_pos, mouse_pressed) and self.click_cooldown == 0:
@@ -472,189 +695,87 @@ class Game:
             self.state = GameState.MENU
     
     def draw_game(self):
+        # Chaque couche collecte ses blits, envoyés à l'écran en un seul Surface.blits par couche
+        queue = self.render_queue
+        background = queue.layer('background')
+        
         # Fond du royaume - supporter images ET vidéos
-        if self.current_kingdom.bg_type == 'video':
-            # Obtenir le frame vidéo depuis le cache (optimisé)
-            video_surface = self.current_kingdom.get_video_frame()
-            
-            if video_surface:
-                # Dessiner 2 fois le frame pour le scrolling horizontal
-                self.screen.blit(video_surface, (-self.camera_x, 0))
-                self.screen.blit(video_surface, (self.screen_width - self.camera_x, 0))
+        kingdom = self.current_kingdom
+        if kingdom.bg_type == 'video':
+            # Frame vidéo du moment (décodée en continu sur un thread), répétée sur tout le monde
+            bg = kingdom.get_video_frame(quality.tier['video_frame_step'])
+            if bg:
+                # Uniquement la partie visible, coutures gérées par des zones source
+                self.background.draw(background, bg, self.camera_x)
             else:
                 # Fallback: couleur unie
-                self.screen.fill(self.current_kingdom.bg_color)
-        
-        elif self.current_kingdom.bg_image:
-            # Code existant pour les images
-            bg = self.current_kingdom.bg_image
-            self.screen.blit(bg, (-self.camera_x, 0))
-            self.screen.blit(bg, (self.screen_width - self.camera_x, 0))
+                background.fill(kingdom.bg_color)
         else:
-            self.screen.fill(self.current_kingdom.bg_color)
+            # Tranche de fond de chaque tronçon visible (couleur unie tant qu'elle n'est pas chargée)
+            chunks = []
+            for chunk in kingdom.visible_chunks(self.camera_x):
+                bg = kingdom.get_background(chunk.bg_path)
+                chunks.append((chunk.x, chunk.width, bg))
+            self.background.draw_chunks(background, chunks, self.camera_x, kingdom.bg_color)
                 
+        # Seules les entités visibles sont dessinées (compteurs dans self.culler)
+        self.culler.begin_frame()
+        
         # Dessiner les ennemis
-        for enemy in self.current_kingdom.enemies:
-            enemy.draw(self.screen, self.camera_x, self.camera_y)
+        enemies = queue.layer('enemies')
+        for enemy in self.culler.visible(kingdom.enemies, 'enemies', self.camera_x, self.camera_y):
+            enemy.draw(enemies, self.camera_x, self.camera_y)
         
         # Dessiner les projectiles
-        for projectile in self.projectiles:
-            projectile.draw(self.screen, self.camera_x, self.camera_y)
+        projectiles = queue.layer('projectiles')
+        for projectile in self.culler.visible(self.projectiles, 'projectiles', self.camera_x, self.camera_y):
+            projectile.draw(projectiles, self.camera_x, self.camera_y)
         
-        # Dessiner les particules
-        for particle in self.particles:
-            particle.draw(self.screen)
+        # Dessiner les particules (déjà en coordonnées écran)
+        particles = queue.layer('particles')
+        for particle in self.culler.visible(self.particles, 'particles'):
+            particle.draw(particles)
         
         # Dessiner le joueur
-        self.player.draw(self.screen, self.camera_x, self.camera_y)
+        self.player.draw(queue.layer('player'), self.camera_x, self.camera_y)
         
         # HUD
-        self.draw_hud()
+        self.draw_hud(queue.layer('hud'))
         
         # Dialogue
         if self.dialogue_timer > 0:
-            self.draw_dialogue()
+            self.draw_dialogue(queue.layer('ui'))
             self.dialogue_timer -= 1
-    
-    def draw_hud(self):
-        margin = int(20 * self.scale)
-        
-        # === BARRE DE VIE ===
-        hp_y = margin
-        
-        # Barre de vie directement
-        hp_bar_x = margin
-        hp_bar_width = int(250 * self.scale)
-        hp_bar_height = int(24 * self.scale)
-        hp_percentage = self.player.hp / self.player.max_hp
-        
-        # Fond noir avec bordure dorée (style rétro)
-        pygame.draw.rect(self.screen, (0, 0, 0), (hp_bar_x - 2, hp_y - 2, hp_bar_width + 4, hp_bar_height + 4))
-        pygame.draw.rect(self.screen, (180, 150, 50), (hp_bar_x - 2, hp_y - 2, hp_bar_width + 4, hp_bar_height + 4), 2)
-        
-        # Barre de vie (dégradé vert -> jaune -> rouge selon HP)
-        if hp_percentage > 0.5:
-            bar_color = (50, 220, 50)
-        elif hp_percentage > 0.25:
-            bar_color = (220, 180, 50)
-        else:
-            bar_color = (220, 50, 50)
-        pygame.draw.rect(self.screen, bar_color, (hp_bar_x, hp_y, int(hp_bar_width * hp_percentage), hp_bar_height))
-        
-        # Texte HP
-        hp_text = self.small_font.render(f"{self.player.hp}/{self.player.max_hp}", True, WHITE)
-        self.screen.blit(hp_text, (hp_bar_x + hp_bar_width + int(10 * self.scale), hp_y + int(2 * self.scale)))
-        
-        # === ÉLÉMENTS (style icônes Avatar) ===
-        elem_x = int(500 * self.scale)
-        elem_size = int(32 * self.scale)
-        elem_spacing = int(50 * self.scale)
-        
-        element_colors = {
-            Element.EAU: ((50, 150, 255), "💧"),
-            Element.TERRE: ((139, 90, 43), "🌍"),
-            Element.AIR: ((200, 230, 255), "💨"),
-            Element.FEU: ((255, 80, 30), "🔥")
-        }
-        
-        for i, elem in enumerate([Element.EAU, Element.TERRE, Element.AIR, Element.FEU]):
-            ex = elem_x + i * elem_spacing
-            color, _ = element_colors[elem]
-            
-            if elem in self.player.elements:
-                # Élément débloqué - carré brillant
-                pygame.draw.rect(self.screen, color, (ex, hp_y, elem_size, elem_size))
-                pygame.draw.rect(self.screen, (255, 255, 255), (ex, hp_y, elem_size, elem_size), 2)
-                # Effet brillant
-                pygame.draw.line(self.screen, (255, 255, 255), (ex + 2, hp_y + 2), (ex + 8, hp_y + 8), 2)
-            else:
-                # Élément verrouillé - gris avec croix
-                pygame.draw.rect(self.screen, (40, 40, 40), (ex, hp_y, elem_size, elem_size))
-                pygame.draw.rect(self.screen, (80, 80, 80), (ex, hp_y, elem_size, elem_size), 1)
-        
-        # === ATTAQUE SPÉCIALE (style barre d'énergie) ===
-        special_x = int(750 * self.scale)
-        special_width = int(200 * self.scale)
-        special_height = int(24 * self.scale)
-        
-        # Texte
-        special_label = self.small_font.render("⚡ SPÉCIAL", True, (255, 200, 50))
-        self.screen.blit(special_label, (special_x, hp_y - int(2 * self.scale)))
-        
-        bar_x = special_x + special_label.get_width() + int(15 * self.scale)
-        
-        # Calculer progression
-        if self.player.special_cooldown_max > 0:
-            progress = 1 - (self.player.special_cooldown / self.player.special_cooldown_max)
-        else:
-            progress = 1
         
-        # Fond et bordure
-        pygame.draw.rect(self.screen, (0, 0, 0), (bar_x - 2, hp_y - 2, special_width + 4, special_height + 4))
+        queue.flush()
         
-        if self.player.special_cooldown <= 0:
-            # Prêt = effet pulsant doré
-            bar_color = (255, 200, 50)
-            pygame.draw.rect(self.screen, (255, 215, 0), (bar_x - 2, hp_y - 2, special_width + 4, special_height + 4), 2)
-            status = "PRÊT!"
-        else:
-            bar_color = (150, 100, 30)
-            pygame.draw.rect(self.screen, (100, 80, 30), (bar_x - 2, hp_y - 2, special_width + 4, special_height + 4), 2)
-            status = f"{self.player.special_cooldown // 60}s"
-        
-        pygame.draw.rect(self.screen, bar_color, (bar_x, hp_y, int(special_width * progress), special_height))
-        
-        # Texte status
-        status_text = self.small_font.render(status, True, WHITE)
-        self.screen.blit(status_text, (bar_x + special_width // 2 - status_text.get_width() // 2, hp_y + int(2 * self.scale)))
-        
-        # === ENNEMIS RESTANTS ===
-        enemies_x = int(1050 * self.scale)
-        enemy_count = len(self.current_kingdom.enemies)
-        enemies_text = self.small_font.render(f"x{enemy_count}", True, (255, 100, 100) if enemy_count > 0 else (100, 255, 100))
-        self.screen.blit(enemies_text, (enemies_x, hp_y + int(2 * self.scale)))
-        
-        # === OR ===
-        gold_x = int(1150 * self.scale)
-        gold_text = self.small_font.render(f"OR: {self.player.gold}", True, (255, 215, 0))
-        self.screen.blit(gold_text, (gold_x, hp_y + int(2 * self.scale)))
+        # Effets d'écran sur la frame finale (teinte de l'élément du royaume, tremblement, flash)
+        self.postfx.get('grade').set_color(ELEMENT_COLORS.get(kingdom.element))
+        self.postfx.apply()
+    
+    def draw_hud(self, target):
+        # Calque en cache: seuls les widgets dont les entrées ont changé sont redessinés
+        self.hud.update(self.player, self.current_kingdom.remaining_enemies())
+        self.hud.draw(target)
     
-    def draw_dialogue(self):
+    def draw_dialogue(self, target):
         # Boîte de dialogue en bas
         dialogue_height = int(120 * self.scale)
         dialogue_width = self.screen_width - int(150 * self.scale)
         margin_x = int(75 * self.scale)
         margin_bottom = int(30 * self.scale)
         
-        dialogue_surface = pygame.Surface((dialogue_width, dialogue_height))
-        dialogue_surface.set_alpha(220)
-        dialogue_surface.fill((20, 20, 40))
-        self.screen.blit(dialogue_surface, (margin_x, self.screen_height - dialogue_height - margin_bottom))
-        
-        pygame.draw.rect(self.screen, YELLOW, 
-                       (margin_x, self.screen_height - dialogue_height - margin_bottom, 
-                        dialogue_width, dialogue_height), int(3 * self.scale))
-        
-        # Texte
-        lines = []
-        words = self.dialogue_text.split()
-        current_line = ""
+        target.blit(self.dialogue_box, (margin_x, self.screen_height - dialogue_height - margin_bottom))
         
+        # Texte: retours à la ligne calculés une fois par message, lignes rendues depuis le cache
         text_margin = int(80 * self.scale)
-        for word in words:
-            test_line = current_line + word + " "
-            if self.text_font.size(test_line)[0] < dialogue_width - text_margin:
-                current_line = test_line
-            else:
-                lines.append(current_line)
-                current_line = word + " "
-        lines.append(current_line)
+        lines = text_cache.wrap(self.text_font, self.dialogue_text, dialogue_width - text_margin)
         
         line_spacing = int(40 * self.scale)
         y = self.screen_height - dialogue_height - int(5 * self.scale)
         for line in lines[:3]:
-            text_surf = self.text_font.render(line.strip(), True, WHITE)
-            self.screen.blit(text_surf, (margin_x + int(25 * self.scale), y))
+            text_surf = text_cache.render(self.text_font, line, WHITE)
+            target.blit(text_surf, (margin_x + int(25 * self.scale), y))
             y += line_spacing
     
     def update_game(self, keys):
@@ -693,6 +814,9 @@ class Game:
             if enemy.get_rect().colliderect(player_rect):
                 damage = self.player.take_damage(enemy.attack)
                 if damage > 0:
+                    self.postfx.get('shake').trigger(12)
+                    self.postfx.get('flash').set_color(RED, 110)
+                    self.postfx.get('flash').trigger(12)
                     self.create_particles(self.player.x + self.player.width // 2,
                                         self.player.y + self.player.height // 2,
                                         RED, 15)
@@ -740,7 +864,7 @@ class Game:
                 self.particles.remove(particle)
         
         # Vérifier victoire du royaume
-        if len(self.current_kingdom.enemies) == 0 and not self.current_kingdom.completed:
+        if self.current_kingdom.remaining_enemies() == 0 and not self.current_kingdom.completed:
             self.current_kingdom.completed = True
             self.player.unlock_element(self.current_kingdom.element)
             self.show_dialogue(f"Royaume libéré ! Élément {self.current_kingdom.element.name} débloqué !")
@@ -756,8 +880,9 @@ class Game:
         if self.player.hp <= 0:
             self.state = GameState.GAME_OVER
         
-        # Mettre à jour la caméra
+        # Mettre à jour la caméra, puis les tronçons autour d'elle
         self.update_camera()
+        self.current_kingdom.update_streaming(self.camera_x, self.loader)
     
     def draw_victory(self):
         self.screen.fill((20, 20, 40))
@@ -774,35 +899,14 @@ class Game:
             if particle.lifetime <= 0:
                 self.particles.remove(particle)
         
-        # Titre de victoire
-        victory_text = self.title_font.render("VICTOIRE !", True, (255, 215, 0))
-        victory_rect = victory_text.get_rect(center=(self.screen_width // 2, int(180 * self.scale)))
-        self.screen.blit(victory_text, victory_rect)
-        
-        # Messages
-        messages = [
-            "Tu as libéré tous les Gardiens !",
-            "L'équilibre est restauré dans Aelyra.",
-            "Le Néant a été vaincu.",
-            "Tu es le véritable Avatar !"
-        ]
-        
-        y = int(300 * self.scale)
-        message_spacing = int(55 * self.scale)
-        for message in messages:
-            msg_text = self.text_font.render(message, True, WHITE)
-            msg_rect = msg_text.get_rect(center=(self.screen_width // 2, y))
-            self.screen.blit(msg_text, msg_rect)
-            y += message_spacing
+        # Titre de victoire et messages
+        for label in self.victory_labels:
+            label.draw(self.screen)
         
         # Bouton retour au menu
-        button_width = int(350 * self.scale)
-        button_height = int(75 * self.scale)
-        menu_button = Button(self.screen_width // 2 - button_width // 2, int(540 * self.scale), 
-                           button_width, button_height,
-                           "Retour au Menu", (34, 139, 34), (50, 180, 50), self.scale)
+        menu_button = self.victory_button
         
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.target.mouse_pos()
         mouse_pressed = pygame.mouse.get_pressed()
         
         menu_button.check_hover(mouse_pos)
@@ -815,36 +919,24 @@ class Game:
             self.state = GameState.MENU
     
     def draw_game_over(self):
-        self.screen.fill((20, 0, 0))
-        
-        # Titre Game Over
-        gameover_text = self.title_font.render("GAME OVER", True, RED)
-        gameover_rect = gameover_text.get_rect(center=(self.screen_width // 2, int(210 * self.scale)))
-        self.screen.blit(gameover_text, gameover_rect)
-        
-        # Message
-        msg_text = self.text_font.render("Le Néant a triomphé...", True, WHITE)
-        msg_rect = msg_text.get_rect(center=(self.screen_width // 2, int(320 * self.scale)))
-        self.screen.blit(msg_text, msg_rect)
+        # Écran statique: seuls les boutons sont redessinés, au changement de survol
+        if self.dirty.begin('game_over'):
+            self.screen.fill((20, 0, 0))
+            
+            # Titre Game Over et message
+            for label in self.game_over_labels:
+                label.draw(self.screen)
+            self.dirty.save_background()
         
         # Boutons
-        button_width = int(350 * self.scale)
-        button_height = int(75 * self.scale)
-        retry_button = Button(self.screen_width // 2 - button_width // 2, int(420 * self.scale), 
-                            button_width, button_height,
-                            "Réessayer", (139, 0, 0), (180, 0, 0), self.scale)
-        menu_button = Button(self.screen_width // 2 - button_width // 2, int(520 * self.scale), 
-                           button_width, button_height,
-                           "Menu Principal", (100, 100, 100), (150, 150, 150), self.scale)
+        retry_button = self.game_over_buttons['retry']
+        menu_button = self.game_over_buttons['menu']
         
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.target.mouse_pos()
         mouse_pressed = pygame.mouse.get_pressed()
         
-        retry_button.check_hover(mouse_pos)
-        menu_button.check_hover(mouse_pos)
-        
-        retry_button.draw(self.screen)
-        menu_button.draw(self.screen)
+        self.draw_dirty_button('retry', retry_button, mouse_pos)
+        self.draw_dirty_button('menu', menu_button, mouse_pos)
         
         if retry_button.is_clicked(mouse_pos, mouse_pressed) and self.click_cooldown == 0:
             # Recommencer le jeu actuel sans perdre l'or
@@ -858,50 +950,82 @@ class Game:
             self.current_kingdom_index = 0
             self.state = GameState.MENU
     
-    def draw_pause(self):
-        """Affiche le menu de pause par-dessus le jeu"""
-        # Overlay semi-transparent
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.set_alpha(180)  # Transparence
-        overlay.fill((0, 0, 0))  # Noir
-        self.screen.blit(overlay, (0, 0))
+    def draw_pause(self, background=None):
+        """Affiche le menu de pause par-dessus le jeu figé (image assombrie une seule fois)"""
+        if background is not None:
+            self.screen.blit(background, (0, 0))
         
         # Titre "PAUSE"
-        pause_text = self.title_font.render("PAUSE", True, (255, 255, 255))
-        pause_rect = pause_text.get_rect(center=(self.screen_width // 2, int(200 * self.scale)))
-        self.screen.blit(pause_text, pause_rect)
+        self.pause_title.draw(self.screen)
         
         # Boutons
-        button_width = int(400 * self.scale)
-        button_height = int(80 * self.scale)
-        
-        resume_button = Button(self.screen_width // 2 - button_width // 2, int(350 * self.scale),
-                              button_width, button_height,
-                              "Reprendre la Partie", (34, 139, 34), (50, 180, 50), self.scale)
-        
-        menu_button = Button(self.screen_width // 2 - button_width // 2, int(450 * self.scale),
-                            button_width, button_height,
-                            "Menu Principal", (139, 0, 0), (180, 0, 0), self.scale)
-        
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.target.mouse_pos()
         mouse_pressed = pygame.mouse.get_pressed()
         
-        resume_button.check_hover(mouse_pos)
-        menu_button.check_hover(mouse_pos)
-        
-        resume_button.draw(self.screen)
-        menu_button.draw(self.screen)
+        for button in self.pause_buttons.values():
+            button.check_hover(mouse_pos)
+            button.draw(self.screen)
         
         # Gestion des clics
-        if resume_button.is_clicked(mouse_pos, mouse_pressed) and self.click_cooldown == 0:
+        if self.pause_buttons['resume'].is_clicked(mouse_pos, mouse_pressed) and self.click_cooldown == 0:
             self.click_cooldown = 10
             self.state = GameState.GAME
         
-        if menu_button.is_clicked(mouse_pos, mouse_pressed) and self.click_cooldown == 0:
+        if self.pause_buttons['menu'].is_clicked(mouse_pos, mouse_pressed) and self.click_cooldown == 0:
             self.click_cooldown = 15
             self.current_kingdom_index = 0
             self.state = GameState.MENU
     
+    def handle_double_click(self):
+        """Double-clic en jeu: attaque spéciale"""
+        current_time = pygame.time.get_ticks()
+        if current_time - self.last_click_time < self.double_click_threshold:
+            # Double-clic détecté ! Lancer l'attaque spéciale
+            if self.player.special_cooldown <= 0:
+                # Créer le projectile selon le type acheté
+                elem = list(self.player.elements)[0] if self.player.elements else Element.NONE
+                px = self.player.x + self.player.width // 2
+                py = self.player.y + self.player.height // 2
+                
+                if self.player.special_attack_type == 2:
+                    special = UltraProjectile(px, py, self.player.direction, elem)
+                    particle_color = (255, 100, 255)
+                elif self.player.special_attack_type == 1:
+                    special = MegaProjectile(px, py, self.player.direction, elem)
+                    particle_color = (100, 255, 255)
+                else:
+                    special = SpecialProjectile(px, py, self.player.direction, elem)
+                    particle_color = (255, 200, 50)
+                
+                self.projectiles.append(special)
+                self.player.special_cooldown = self.player.special_cooldown_max
+                self.create_particles(px, py, particle_color, 40)
+                self.postfx.get('flash').set_color(particle_color, 90)
+                self.postfx.get('flash').trigger(8)
+        self.last_click_time = current_time
+    
+    def assign_key(self, key):
+        """Paramètres: touche pressée pendant l'attente d'une nouvelle touche"""
+        if key == pygame.K_ESCAPE:
+            # Annuler
+            self.waiting_for_key = False
+            self.selected_action = None
+        else:
+            # Assigner la nouvelle touche
+            self.keybindings[self.selected_action] = [key]
+            self.waiting_for_key = False
+            self.selected_action = None
+    
+    def next_kingdom(self):
+        """Timer pour passer au royaume suivant"""
+        if self.current_kingdom is not None:
+            self.current_kingdom.stop_video()
+        self.current_kingdom = self.kingdoms[self.current_kingdom_index]
+        self.player.x = 100
+        self.player.y = 630  # Spawn on the bridge
+        self.projectiles = []
+        self.show_dialogue(f"Bienvenue dans le {self.current_kingdom.name}...")
+    
     def run(self):
         running = True
         
@@ -910,88 +1034,51 @@ class Game:
                 if event.type == pygame.QUIT:
                     running = False
                 
-                # Détection touche Échap pour pause (uniquement en jeu)
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    if self.state == GameState.GAME:
-                        self.state = GameState.PAUSED
-                    elif self.state == GameState.PAUSED:
-                        self.state = GameState.GAME
-                
-                # Gestion des touches pour les paramètres
-                if self.state == GameState.SETTINGS and self.waiting_for_key:
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_ESCAPE:
-                            # Annuler
-                            self.waiting_for_key = False
-                            self.selected_action = None
-                        else:
-                            # Assigner la nouvelle touche
-                            self.keybindings[self.selected_action] = [event.key]
-                            self.waiting_for_key = False
-                            self.selected_action = None
+                # Fenêtre ré-exposée: le contenu affiché n'est plus garanti
+                if event.type == pygame.VIDEOEXPOSE:
+                    self.dirty.invalidate()
                 
-                # Double-clic pour attaque spéciale
-                if self.state == GameState.GAME and event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button == 1:  # Left click
-                        current_time = pygame.time.get_ticks()
-                        if current_time - self.last_click_time < self.double_click_threshold:
-                            # Double-clic détecté ! Lancer l'attaque spéciale
-                            if self.player.special_cooldown <= 0:
-                                # Créer le projectile selon le type acheté
-                                elem = list(self.player.elements)[0] if self.player.elements else Element.NONE
-                                px = self.player.x + self.player.width // 2
-                                py = self.player.y + self.player.height // 2
-                                
-                                if self.player.special_attack_type == 2:
-                                    special = UltraProjectile(px, py, self.player.direction, elem)
-                                    particle_color = (255, 100, 255)
-                                elif self.player.special_attack_type == 1:
-                                    special = MegaProjectile(px, py, self.player.direction, elem)
-                                    particle_color = (100, 255, 255)
-                                else:
-                                    special = SpecialProjectile(px, py, self.player.direction, elem)
-                                    particle_color = (255, 200, 50)
-                                
-                                self.projectiles.append(special)
-                                self.player.special_cooldown = self.player.special_cooldown_max
-                                self.create_particles(px, py, particle_color, 40)
-                        self.last_click_time = current_time
-                
-                # Timer pour passer au royaume suivant
+                # Le royaume suivant arrive quel que soit l'écran affiché
                 if event.type == pygame.USEREVENT + 1:
-                    self.current_kingdom = self.kingdoms[self.current_kingdom_index]
-                    self.player.x = 100
-                    self.player.y = 630  # Spawn on the bridge
-                    self.projectiles = []
-                    self.show_dialogue(f"Bienvenue dans le {self.current_kingdom.name}...")
+                    self.next_kingdom()
+                
+                # Échap, double-clic, touches des paramètres: gérés par la scène du sommet
+                self.scenes.top.handle_event(event)
             
             # Mettre à jour les touches
             keys_pressed = pygame.key.get_pressed()
             
+            # Horloge d'animation partagée par tous les sprites
+            animation_clock.tick()
+            
+            # Finaliser les assets chargés en arrière-plan
+            self.loader.poll()
+            
             # Décrémenter le cooldown de clic
             if self.click_cooldown > 0:
                 self.click_cooldown -= 1
             
-            # Dessiner selon l'état
-            if self.state == GameState.MENU:
-                self.draw_menu()
-            elif self.state == GameState.SHOP:
-                self.draw_shop()
-            elif self.state == GameState.SETTINGS:
-                self.draw_settings()
-            elif self.state == GameState.GAME:
-                self.update_game(keys_pressed)
-                self.draw_game()
-            elif self.state == GameState.PAUSED:
-                self.draw_game()  # Afficher le jeu en arrière-plan
-                self.draw_pause()  # Overlay du menu pause
-            elif self.state == GameState.VICTORY:
-                self.draw_victory()
-            elif self.state == GameState.GAME_OVER:
-                self.draw_game_over()
+            # Mise à jour et dessin de la scène du sommet (un overlay ne redessine pas la scène figée)
+            scene = self.scenes.top
+            scene.update(keys_pressed)
+            scene.draw()
             
-            pygame.display.flip()
+            # Les écrans statiques n'envoient que leurs zones modifiées
+            if not self.dirty.present():
+                self.target.flip()
             self.clock.tick(FPS)
-        
+            
+            # Temps de calcul de la frame (hors attente): palier de qualité adapté
+            if quality.record(self.clock.get_rawtime()):
+                self.apply_quality()
+                if DEBUG_REPORTS:
+                    print(quality.report())
+        
+        video_cache.cancel()
+        self.loader.shutdown()
+        for kingdom in self.kingdoms:
+            kingdom.stop_video()
+        if self.menu_video is not None:
+            self.menu_video.stop()
         pygame.quit()
         sys.exit()
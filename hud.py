@@ -0,0 +1,186 @@
+import pygame
+from constants import WHITE
+from enums import Element
+from display_format import new_surface
+from text import text_cache, glyph_text
+
+ELEMENT_ORDER = [Element.EAU, Element.TERRE, Element.AIR, Element.FEU]
+ELEMENT_COLORS = {
+    Element.EAU: (50, 150, 255),
+    Element.TERRE: (139, 90, 43),
+    Element.AIR: (200, 230, 255),
+    Element.FEU: (255, 80, 30)
+}
+WIDGETS = ('hp', 'elements', 'special', 'enemies', 'gold')
+
+
+def premultiplied(surface):
+    """Copie au format de l'écran en alpha prémultiplié"""
+    # premul_alpha ignore le padding des lignes des surfaces de texte: convertir d'abord
+    return surface.convert_alpha().premul_alpha()
+
+
+class HudLayer:
+    """HUD composé dans une surface en cache: chaque widget n'est redessiné que si ses entrées changent"""
+    def __init__(self, screen_width, scale, font):
+        self.scale = scale
+        self.font = font
+
+        # Disposition (référence 1366x768, comme le reste de l'interface)
+        self.margin = int(20 * scale)
+        self.hp_y = self.margin
+        self.hp_bar_width = int(250 * scale)
+        self.hp_bar_height = int(24 * scale)
+        self.elem_x = int(500 * scale)
+        self.elem_size = int(32 * scale)
+        self.elem_spacing = int(50 * scale)
+        self.special_x = int(750 * scale)
+        self.special_width = int(200 * scale)
+        self.special_height = int(24 * scale)
+        self.enemies_x = int(1050 * scale)
+        self.gold_x = int(1150 * scale)
+
+        # Calque en alpha prémultiplié: le texte antialiasé se compose comme s'il était dessiné sur l'écran
+        self.height = self.hp_y + max(self.elem_size, self.special_height + 2, font.get_linesize() + int(2 * scale)) + 2
+        self.surface = new_surface((screen_width, self.height), alpha=True)
+        self.surface.fill((0, 0, 0, 0))
+
+        # Le libellé ne change jamais: rendu une seule fois
+        self.special_label = premultiplied(text_cache.render(font, "⚡ SPÉCIAL", (255, 200, 50)))
+        self.special_bar_x = self.special_x + self.special_label.get_width() + int(15 * scale)
+        self.ready_text = premultiplied(text_cache.render(font, "PRÊT!", WHITE))
+
+        # Compteurs: glyphes pré-rendus, un blit par caractère et aucune surface créée
+        self.white_glyphs = glyph_text.get(font, WHITE, premultiplied=True)
+        self.gold_glyphs = glyph_text.get(font, (255, 215, 0), premultiplied=True)
+        self.enemy_glyphs = glyph_text.get(font, (255, 100, 100), premultiplied=True)
+        self.cleared_glyphs = glyph_text.get(font, (100, 255, 100), premultiplied=True)
+
+        # Zone de chaque widget dans le calque ; la barre spéciale déborde sous le compteur d'ennemis
+        self.regions = {
+            'hp': pygame.Rect(0, 0, self.elem_x, self.height),
+            'elements': pygame.Rect(self.elem_x, 0, self.special_x - self.elem_x, self.height),
+            'special': pygame.Rect(self.special_x, 0, self.special_bar_x + self.special_width + 2 - self.special_x, self.height),
+            'enemies': pygame.Rect(self.enemies_x, 0, self.gold_x - self.enemies_x, self.height),
+            'gold': pygame.Rect(self.gold_x, 0, screen_width - self.gold_x, self.height)
+        }
+
+        self.inputs = {}  # widget -> entrées au dernier rendu
+        self.rebuilds = {name: 0 for name in WIDGETS}
+
+    def update(self, player, enemy_count):
+        """Redessine dans le calque les widgets dont les entrées ont changé"""
+        unlocked = tuple(elem in player.elements for elem in ELEMENT_ORDER)
+        if player.special_cooldown_max > 0:
+            progress = 1 - (player.special_cooldown / player.special_cooldown_max)
+        else:
+            progress = 1
+        ready = player.special_cooldown <= 0
+        status = "PRÊT!" if ready else f"{player.special_cooldown // 60}s"
+        # La barre avance en continu: l'entrée est sa largeur en pixels, pas le temps restant
+        fill_width = int(self.special_width * progress)
+
+        inputs = {
+            'hp': (player.hp, player.max_hp),
+            'elements': (unlocked,),
+            'special': (fill_width, ready, status),
+            'enemies': (enemy_count,),
+            'gold': (player.gold,)
+        }
+        dirty = {name for name in WIDGETS if self.inputs.get(name) != inputs[name]}
+        if not dirty:
+            return
+
+        # Effacer une zone efface aussi le bord des widgets qui la chevauchent: ils sont redessinés
+        for name in WIDGETS:
+            if name not in dirty and any(self.regions[name].colliderect(self.regions[other]) for other in dirty):
+                dirty.add(name)
+
+        for name in WIDGETS:
+            if name in dirty:
+                self.surface.fill((0, 0, 0, 0), self.regions[name])
+        for name in WIDGETS:  # Dans l'ordre d'origine: le compteur d'ennemis passe sur la barre
+            if name in dirty:
+                self.inputs[name] = inputs[name]
+                self.rebuilds[name] += 1
+                getattr(self, 'paint_' + name)(*inputs[name])
+
+    def blit_text(self, text, pos):
+        self.surface.blit(text, pos, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    def paint_hp(self, hp, max_hp):
+        x, y = self.margin, self.hp_y
+        hp_percentage = hp / max_hp
+
+        # Fond noir avec bordure dorée (style rétro)
+        frame = (x - 2, y - 2, self.hp_bar_width + 4, self.hp_bar_height + 4)
+        pygame.draw.rect(self.surface, (0, 0, 0), frame)
+        pygame.draw.rect(self.surface, (180, 150, 50), frame, 2)
+
+        # Barre de vie (dégradé vert -> jaune -> rouge selon HP)
+        if hp_percentage > 0.5:
+            bar_color = (50, 220, 50)
+        elif hp_percentage > 0.25:
+            bar_color = (220, 180, 50)
+        else:
+            bar_color = (220, 50, 50)
+        pygame.draw.rect(self.surface, bar_color, (x, y, int(self.hp_bar_width * hp_percentage), self.hp_bar_height))
+
+        # Texte HP
+        self.white_glyphs.draw(self.surface, f"{hp}/{max_hp}",
+                               (x + self.hp_bar_width + int(10 * self.scale), y + int(2 * self.scale)))
+
+    def paint_elements(self, unlocked):
+        y = self.hp_y
+        size = self.elem_size
+        for i, elem in enumerate(ELEMENT_ORDER):
+            ex = self.elem_x + i * self.elem_spacing
+            if unlocked[i]:
+                # Élément débloqué - carré brillant
+                pygame.draw.rect(self.surface, ELEMENT_COLORS[elem], (ex, y, size, size))
+                pygame.draw.rect(self.surface, (255, 255, 255), (ex, y, size, size), 2)
+                # Effet brillant
+                pygame.draw.line(self.surface, (255, 255, 255), (ex + 2, y + 2), (ex + 8, y + 8), 2)
+            else:
+                # Élément verrouillé - gris
+                pygame.draw.rect(self.surface, (40, 40, 40), (ex, y, size, size))
+                pygame.draw.rect(self.surface, (80, 80, 80), (ex, y, size, size), 1)
+
+    def paint_special(self, fill_width, ready, status):
+        y = self.hp_y
+        self.blit_text(self.special_label, (self.special_x, y - int(2 * self.scale)))
+        bar_x = self.special_bar_x
+
+        # Fond et bordure (dorée quand l'attaque est prête)
+        frame = (bar_x - 2, y - 2, self.special_width + 4, self.special_height + 4)
+        pygame.draw.rect(self.surface, (0, 0, 0), frame)
+        if ready:
+            bar_color = (255, 200, 50)
+            pygame.draw.rect(self.surface, (255, 215, 0), frame, 2)
+        else:
+            bar_color = (150, 100, 30)
+            pygame.draw.rect(self.surface, (100, 80, 30), frame, 2)
+        pygame.draw.rect(self.surface, bar_color, (bar_x, y, fill_width, self.special_height))
+
+        # Texte status, par-dessus la barre opaque
+        status_y = y + int(2 * self.scale)
+        if ready:
+            self.blit_text(self.ready_text, (bar_x + self.special_width // 2 - self.ready_text.get_width() // 2, status_y))
+        else:
+            status_width = self.white_glyphs.size(status)[0]
+            self.white_glyphs.draw(self.surface, status, (bar_x + self.special_width // 2 - status_width // 2, status_y))
+
+    def paint_enemies(self, enemy_count):
+        glyphs = self.enemy_glyphs if enemy_count > 0 else self.cleared_glyphs
+        glyphs.draw(self.surface, f"x{enemy_count}", (self.enemies_x, self.hp_y + int(2 * self.scale)))
+
+    def paint_gold(self, gold):
+        self.gold_glyphs.draw(self.surface, f"OR: {gold}", (self.gold_x, self.hp_y + int(2 * self.scale)))
+
+    def draw(self, screen):
+        """Un seul blit par frame"""
+        screen.blit(self.surface, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    def get_stats(self):
+        """Nombre de rendus de chaque widget depuis la création du calque"""
+        return dict(self.rebuilds)
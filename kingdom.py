@@ -1,122 +1,224 @@
 import random
-import pygame
-import cv2
+import asset_cache
+from asset_registry import asset_registry
+import video_cache
+from constants import KINGDOM_CHUNKS, CHUNK_ACTIVE_MARGIN, CHUNK_PREFETCH_MARGIN
 from enums import Element
 from enemy import Enemy
+from world import WorldChunk
 
 class Kingdom:
-    def __init__(self, name, element, bg_color, bg_path=None, bg_type='image', screen_width=1366, screen_height=768, kingdom_index=0):
+    def __init__(self, name, element, bg_color, bg_path=None, bg_type='image', screen_width=1366, screen_height=768, kingdom_index=0, load_assets=True,
+                 chunk_count=KINGDOM_CHUNKS):
         self.name = name
         self.element = element
         self.bg_color = bg_color
         self.completed = False
-        self.enemies = []
+        self.enemies = []  # Ennemis des tronçons actifs (mis à jour et dessinés)
+        self.sleeping = 0  # Ennemis en sommeil dans les tronçons inactifs (compte tenu à jour)
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.kingdom_index = kingdom_index
+        self.ground_level = 640
         
-        # Largeur du monde = 2 écrans
-        self.world_width = screen_width * 2
+        # Monde découpé en tronçons d'un écran ; largeur = nombre de tronçons
+        self.chunk_width = screen_width
+        self.world_width = self.chunk_width * chunk_count
         
         # Type de fond: 'image' ou 'video'
+        # Les surfaces vivent dans l'asset_registry (budget mémoire) et sont rechargées si évincées
+        self.bg_path = bg_path
         self.bg_type = bg_type
-        self.bg_image = None
-        self.bg_video_frames = []  # Cache de frames pour performance
-        self.bg_video_frame_index = 0  # Index du frame actuel
+        self.has_bg_image = False
+        self.bg_stream = None  # Fond vidéo: frames en cache (mmap) ou décodées par un thread à l'affichage
         
-        # Load background (image ou video)
-        if bg_path:
-            if bg_type == 'video':
-                # Charger la vidéo avec cv2 et pré-cacher tous les frames
-                try:
-                    print(f"Chargement vidéo {bg_path}...")
-                    video = cv2.VideoCapture(bg_path)
-                    
-                    if not video.isOpened():
-                        print(f"Warning: Could not load background video {bg_path}")
-                    else:
-                        # Pré-charger TOUS les frames pour performance optimale
-                        frame_count = 0
-                        while True:
-                            ret, frame = video.read()
-                            if not ret:
-                                break
-                            
-                            # Convertir BGR -> RGB
-                            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                            
-                            # Redimensionner pour remplir l'écran
-                            video_height, video_width = frame.shape[:2]
-                            scale_width = screen_width / video_width
-                            scale_height = screen_height / video_height
-                            scale = max(scale_width, scale_height)
-                            
-                            new_width = int(video_width * scale)
-                            new_height = int(video_height * scale)
-                            
-                            frame = cv2.resize(frame, (new_width, new_height), 
-                                             interpolation=cv2.INTER_LINEAR)
-                            
-                            # Cropper au centre
-                            x_offset = (new_width - screen_width) // 2
-                            y_offset = (new_height - screen_height) // 2
-                            frame = frame[y_offset:y_offset + screen_height, 
-                                        x_offset:x_offset + screen_width]
-                            
-                            # Convertir en Surface Pygame et stocker en cache
-                            surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-                            self.bg_video_frames.append(surface)
-                            frame_count += 1
-                        
-                        video.release()
-                        print(f"✓ {frame_count} frames vidéo chargés et mis en cache")
-                        
-                except Exception as e:
-                    print(f"Error loading video {bg_path}: {e}")
-            else:  # image
-                try:
-                    self.bg_image = pygame.image.load(bg_path).convert()
-                    # Scale to actual screen size
-                    self.bg_image = pygame.transform.scale(self.bg_image, (screen_width, screen_height))
-                except:
-                    print(f"Warning: Could not load background image {bg_path}")
-                    self.bg_image = None
+        # Chaque tronçon affiche sa tranche du fond du royaume
+        self.chunks = [WorldChunk(i, i * self.chunk_width, self.chunk_width, bg_path) for i in range(chunk_count)]
+        self.active_range = range(0)  # Indices des tronçons actifs
+        self.bg_ready = set()  # Fonds de tronçons chargés (les surfaces restent dans le registre)
+        self.bg_pending = set()  # Fonds demandés à l'AssetLoader
+        self.bg_failed = set()  # Fonds illisibles: pas de nouvelle tentative
         
-        self.generate_world()
+        # Sans load_assets, le fond est chargé plus tard (AssetLoader) et le monde généré par start_game
+        if load_assets:
+            if bg_path:
+                self.finish_background(self.decode_background())
+            self.generate_world()
     
-    def get_video_frame(self):
-        """Retourne le frame actuel du cache (optimisé pour performance)"""
-        if not self.bg_video_frames:
+    def decode_background(self):
+        """Lecture et décodage du fond, sans créer de Surface (peut tourner sur un thread)"""
+        if not self.bg_path:
             return None
-        
-        # Obtenir le frame actuel depuis le cache
-        surface = self.bg_video_frames[self.bg_video_frame_index]
-        
-        # Avancer à la frame suivante (boucle automatique)
-        self.bg_video_frame_index = (self.bg_video_frame_index + 1) % len(self.bg_video_frames)
-        
-        return surface
+        if self.bg_type == 'video':
+            # Frames déjà transcodées pour cet écran, sinon décodée en continu à l'affichage (VideoStream)
+            return video_cache.open_video(self.bg_path, (self.screen_width, self.screen_height))
+        return self.decode_background_image(self.bg_path)
+    
+    def decode_background_image(self, path):
+        try:
+            # Pixels déjà redimensionnés à la taille de l'écran (cache disque par résolution)
+            return asset_cache.read_image(path, (self.screen_width, self.screen_height),
+                                          resolution=(self.screen_width, self.screen_height))
+        except:
+            print(f"Warning: Could not load background image {path}")
+            return None
+    
+    def background_key(self, path):
+        return ('background', path, (self.screen_width, self.screen_height))
+    
+    def load_background_image(self, path=None):
+        return asset_cache.load_image(path or self.bg_path, (self.screen_width, self.screen_height), False,
+                                      (self.screen_width, self.screen_height))
+    
+    def finish_background(self, decoded):
+        """Crée les surfaces du fond à partir de decode_background (thread principal)"""
+        if self.bg_type == 'video':
+            # La lecture démarre au premier affichage
+            self.bg_stream = video_cache.make_stream(self.bg_path, (self.screen_width, self.screen_height), decoded)
+        elif self.bg_path:
+            self.finish_background_image(self.bg_path, decoded)
+            self.has_bg_image = decoded is not None
+    
+    def finish_background_image(self, path, decoded):
+        self.bg_pending.discard(path)
+        if decoded is None:
+            self.bg_failed.add(path)
+            return
+        asset_registry.put(self.background_key(path), 'backgrounds', asset_cache.make_surface(decoded),
+                           lambda: self.load_background_image(path))
+        self.bg_ready.add(path)
+    
+    def get_background(self, path=None):
+        """Fond image d'un tronçon (rechargé de façon transparente s'il a été évincé)"""
+        path = path or self.bg_path
+        if path not in self.bg_ready:
+            return None
+        try:
+            return asset_registry.get(self.background_key(path), 'backgrounds',
+                                      lambda: self.load_background_image(path))
+        except:
+            print(f"Warning: Could not reload background image {path}")
+            self.bg_ready.discard(path)
+            if path == self.bg_path:
+                self.has_bg_image = False
+            return None
+    
+    def get_video_frame(self, frame_step=1):
+        """Frame vidéo du moment, au rythme du clip (None tant que la première n'est pas décodée ou si illisible)"""
+        if self.bg_stream is None:
+            return None
+        self.bg_stream.frame_step = frame_step
+        self.bg_stream.start()
+        return self.bg_stream.get_frame()
+    
+    def transcode_background(self):
+        """Écrit le fichier de frames du fond vidéo (thread) ; None s'il existait déjà"""
+        return video_cache.transcode(self.bg_path, (self.screen_width, self.screen_height))
+    
+    def use_video_cache(self, video):
+        self.bg_stream = video_cache.use_cached(self.bg_stream, video)
+    
+    def stop_video(self):
+        """Arrête le décodage quand le royaume n'est plus affiché (le tampon est libéré)"""
+        if self.bg_stream is not None:
+            self.bg_stream.stop()
 
     def generate_world(self):
+        """Répartit les ennemis dans les tronçons ; seuls ceux proches de la caméra sont créés"""
         self.enemies = []
+        self.sleeping = 0
+        self.active_range = range(0)
+        for chunk in self.chunks:
+            chunk.spawns = []
+            chunk.active = False
         
         # Nombre d'ennemis par royaume (5, 7, 8, 9) -> Max 10 avec le boss
         enemy_counts = [5, 7, 8, 9]
         enemy_count = enemy_counts[min(self.kingdom_index, 3)]
-        ground_level = 640
         
-        # Répartir les ennemis sur les 2 écrans
+        # Répartir les ennemis sur tous les tronçons
         for i in range(enemy_count):
-            # Distribution régulière sur la largeur totale (2 écrans)
+            # Distribution régulière sur la largeur totale
             x = int(self.screen_width * 0.5 + (i * (self.world_width - self.screen_width) / max(enemy_count, 1)))
-            y = ground_level
             enemy_type = random.choice(["mini", "normal", "normal"])
-            enemy = Enemy(x, y, enemy_type, self.element, self.kingdom_index, self.world_width)
-            self.enemies.append(enemy)
+            self.chunk_at(x).spawns.append((x, enemy_type, None))
+            self.sleeping += 1
         
-        # Boss à la fin du monde (près de la fin du 2ème écran)
+        # Boss à la fin du monde (près de la fin du dernier tronçon)
         if self.element != Element.NONE:
             boss_x = int(self.world_width - 200)
-            boss_y = ground_level
-            boss = Enemy(boss_x, boss_y, "boss", self.element, self.kingdom_index, self.world_width)
-            self.enemies.append(boss)
+            self.chunk_at(boss_x).spawns.append((boss_x, "boss", None))
+            self.sleeping += 1
+        
+        self.update_streaming(0)
+    
+    def chunk_index(self, x):
+        return max(0, min(int(x // self.chunk_width), len(self.chunks) - 1))
+    
+    def chunk_at(self, x):
+        return self.chunks[self.chunk_index(x)]
+    
+    def chunk_range(self, left, right):
+        """Indices des tronçons qui recouvrent [left, right), calculés sans parcourir la liste"""
+        first = max(0, int(left // self.chunk_width))
+        last = min(len(self.chunks), int(-(-right // self.chunk_width)))
+        return range(first, max(first, last))
+    
+    def visible_chunks(self, camera_x):
+        return [self.chunks[i] for i in self.chunk_range(camera_x, camera_x + self.screen_width)]
+    
+    def remaining_enemies(self):
+        """Ennemis restants, actifs ou encore en sommeil dans un tronçon éloigné"""
+        return len(self.enemies) + self.sleeping
+    
+    def update_streaming(self, camera_x, loader=None):
+        """Active les tronçons proches de la caméra, endort les autres et précharge les fonds à venir"""
+        # Coût proportionnel aux tronçons proches, pas à la longueur du royaume
+        active = self.chunk_range(camera_x - CHUNK_ACTIVE_MARGIN * self.chunk_width,
+                                  camera_x + self.screen_width + CHUNK_ACTIVE_MARGIN * self.chunk_width)
+        if active != self.active_range:
+            for index in self.active_range:
+                if index not in active:
+                    self.chunks[index].active = False
+            for index in active:
+                if index not in self.active_range:
+                    self.activate_chunk(self.chunks[index])
+            self.active_range = active
+        
+        # Les ennemis actifs sortis des tronçons actifs (tronçon endormi ou ennemi qui s'éloigne)
+        # redeviennent de simples entrées du tronçon où ils se trouvent
+        for enemy in [enemy for enemy in self.enemies if self.chunk_index(enemy.x) not in active]:
+            self.sleep_enemy(enemy)
+        
+        if self.bg_type != 'image':
+            return
+        prefetch = self.chunk_range(camera_x - CHUNK_PREFETCH_MARGIN * self.chunk_width,
+                                    camera_x + self.screen_width + CHUNK_PREFETCH_MARGIN * self.chunk_width)
+        wanted = {self.chunks[i].bg_path for i in prefetch if self.chunks[i].bg_path}
+        for path in wanted - self.bg_ready - self.bg_pending - self.bg_failed:
+            if loader is None:
+                self.finish_background_image(path, self.decode_background_image(path))
+            else:
+                self.bg_pending.add(path)
+                loader.submit('streaming', f"{self.name}:{path}", lambda path=path: self.decode_background_image(path),
+                              lambda decoded, path=path: self.finish_background_image(path, decoded))
+        # Les fonds des tronçons éloignés libèrent leur mémoire (rechargés par le préchargement)
+        for path in self.bg_ready - wanted:
+            asset_registry.remove(self.background_key(path))
+            self.bg_ready.discard(path)
+    
+    def activate_chunk(self, chunk):
+        for x, enemy_type, hp in chunk.spawns:
+            enemy = Enemy(x, self.ground_level, enemy_type, self.element, self.kingdom_index, self.world_width)
+            if hp is not None:
+                enemy.hp = hp
+            self.enemies.append(enemy)
+        self.sleeping -= len(chunk.spawns)
+        chunk.spawns = []
+        chunk.active = True
+    
+    def sleep_enemy(self, enemy):
+        """L'ennemi redevient une simple entrée du tronçon où il se trouve"""
+        self.chunk_at(enemy.x).spawns.append((int(enemy.x), enemy.enemy_type, enemy.hp))
+        self.enemies.remove(enemy)
+        self.sleeping += 1
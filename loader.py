@@ -0,0 +1,78 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LoadTask:
+    def __init__(self, group, name, decode, finish, after):
+        self.group = group
+        self.name = name
+        self.decode = decode  # Exécuté sur un thread du pool (fichiers, décodage)
+        self.finish = finish  # Exécuté sur le thread principal (création des surfaces)
+        self.after = after
+        self.future = None
+        self.done = False
+
+
+class AssetLoader:
+    """Décode les assets sur un pool de threads et les finalise sur le thread principal"""
+    def __init__(self, max_workers=4, finish_budget_ms=4):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='asset-loader')
+        self.finish_budget = finish_budget_ms / 1000
+        self.tasks = []  # Tâches en attente ou en cours (les tâches finalisées en sont retirées)
+        self.names = {}  # nom -> dernière tâche soumise sous ce nom (dépendances `after`)
+        self.totals = {}  # groupe -> tâches soumises
+        self.finished = {}  # groupe -> tâches finalisées
+
+    def submit(self, group, name, decode, finish=None, after=None):
+        """Ajoute une tâche ; `after` = nom d'une tâche qui doit être terminée avant de commencer"""
+        task = LoadTask(group, name, decode, finish, after)
+        self.tasks.append(task)
+        self.names[name] = task
+        self.totals[group] = self.totals.get(group, 0) + 1
+        self._start_ready_tasks()
+        return task
+
+    def _start_ready_tasks(self):
+        for task in self.tasks:
+            if task.future is None and (task.after is None or self.names[task.after].done):
+                task.future = self.executor.submit(task.decode)
+
+    def poll(self):
+        """À appeler à chaque frame: finalise les tâches terminées dans la limite du budget"""
+        start = time.perf_counter()
+        finished_any = False
+        for task in self.tasks:
+            if task.future is None or not task.future.done():
+                continue
+            try:
+                result = task.future.result()
+                if task.finish:
+                    task.finish(result)
+            except Exception as e:
+                print(f"Warning: chargement de {task.name} impossible: {e}")
+            task.done = True
+            self.finished[task.group] = self.finished.get(task.group, 0) + 1
+            finished_any = True
+            if time.perf_counter() - start > self.finish_budget:
+                break
+        if finished_any:
+            # La liste ne garde que le travail restant: elle ne grandit pas avec le préchargement en jeu
+            self.tasks = [task for task in self.tasks if not task.done]
+            self._start_ready_tasks()
+
+    def is_ready(self, group=None):
+        return not any(group is None or task.group == group for task in self.tasks)
+
+    def progress(self, group=None):
+        if group is None:
+            total = sum(self.totals.values())
+            finished = sum(self.finished.values())
+        else:
+            total = self.totals.get(group, 0)
+            finished = self.finished.get(group, 0)
+        if not total:
+            return 1.0
+        return finished / total
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
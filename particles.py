@@ -1,6 +1,12 @@
 import random
 import pygame
-from constants import BLACK
+from sprites import sprite_baker
+
+PARTICLE_ALPHA_STEP = 16  # Quantification de la transparence: une vingtaine de sprites par (couleur, taille)
+
+
+def paint_particle(surface, color, radius, alpha):
+    pygame.draw.circle(surface, (*color, alpha), (radius, radius), radius)
 
 class Particle:
     def __init__(self, x, y, color, velocity):
@@ -18,11 +24,15 @@ class Particle:
         self.lifetime -= 1
         self.size = max(1, self.size - 0.1)
     
+    def get_draw_bounds(self):
+        """Zone couverte par draw, en coordonnées écran (les particules ne suivent pas la caméra)"""
+        return pygame.Rect(int(self.x - self.size), int(self.y - self.size), int(self.size * 2), int(self.size * 2))
+    
     def draw(self, screen):
         if self.lifetime > 0:
-            alpha = int(255 * (self.lifetime / 60))
-            s = pygame.Surface((int(self.size * 2), int(self.size * 2)))
-            s.set_alpha(alpha)
-            s.set_colorkey(BLACK)
-            pygame.draw.circle(s, self.color, (int(self.size), int(self.size)), int(self.size))
-            screen.blit(s, (int(self.x - self.size), int(self.y - self.size)))
+            alpha = int(255 * (self.lifetime / 60)) // PARTICLE_ALPHA_STEP * PARTICLE_ALPHA_STEP
+            diameter = int(self.size * 2)
+            radius = int(self.size)
+            sprite = sprite_baker.bake(('particle', self.color, diameter, radius, alpha), (diameter, diameter),
+                                       paint_particle, self.color, radius, alpha)
+            screen.blit(sprite, (int(self.x - self.size), int(self.y - self.size)))
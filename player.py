@@ -3,6 +3,74 @@ import math
 from enums import Direction, Element
 from constants import BLACK, BLUE
 from projectile import Projectile
+from sprites import sprite_cache, sprite_baker
+
+# Marge autour du personnage géométrique (les bras et traits dépassent de la boîte)
+FALLBACK_PADDING = 4
+FALLBACK_SIZE = (40 + FALLBACK_PADDING * 2, 68 + FALLBACK_PADDING * 2)
+ELEMENT_DOT_RADIUS = 5
+
+
+def paint_player_fallback(surface, body_color, head_color, direction, walk_phase, element_color):
+    """Dessine le personnage avec des formes géométriques (origine décalée de FALLBACK_PADDING)"""
+    screen_x = FALLBACK_PADDING
+    screen_y = FALLBACK_PADDING
+    
+    walk_offset = 0
+    if walk_phase is not None:
+        walk_offset = math.sin(walk_phase * math.pi / 2) * 3
+    
+    # Corps
+    body_rect = pygame.Rect(screen_x + 10, screen_y + 20, 20, 25)
+    pygame.draw.rect(surface, body_color, body_rect)
+    pygame.draw.rect(surface, BLACK, body_rect, 2)
+    
+    # Tête
+    pygame.draw.circle(surface, head_color, 
+                     (screen_x + 20, int(screen_y + 15 + walk_offset)), 12)
+    pygame.draw.circle(surface, BLACK, 
+                     (screen_x + 20, int(screen_y + 15 + walk_offset)), 12, 2)
+    
+    # Yeux
+    eye_y = int(screen_y + 13 + walk_offset)
+    pygame.draw.circle(surface, BLACK, (screen_x + 16, eye_y), 2)
+    pygame.draw.circle(surface, BLACK, (screen_x + 24, eye_y), 2)
+    
+    # Bras
+    if direction == Direction.RIGHT:
+        pygame.draw.line(surface, head_color, 
+                       (screen_x + 30, screen_y + 30), 
+                       (screen_x + 38, screen_y + 35), 4)
+    elif direction == Direction.LEFT:
+        pygame.draw.line(surface, head_color,
+                       (screen_x + 10, screen_y + 30),
+                       (screen_x + 2, screen_y + 35), 4)
+    else:
+        pygame.draw.line(surface, head_color,
+                       (screen_x + 10, screen_y + 30),
+                       (screen_x + 5, screen_y + 38), 4)
+        pygame.draw.line(surface, head_color,
+                       (screen_x + 30, screen_y + 30),
+                       (screen_x + 35, screen_y + 38), 4)
+    
+    # Jambes
+    leg_offset = int(walk_offset * 2)
+    pygame.draw.line(surface, BLUE,
+                   (screen_x + 15, screen_y + 45),
+                   (screen_x + 13, screen_y + 60 + leg_offset), 4)
+    pygame.draw.line(surface, BLUE,
+                   (screen_x + 25, screen_y + 45),
+                   (screen_x + 27, screen_y + 60 - leg_offset), 4)
+    
+    # Indicateur d'élément actif
+    if element_color:
+        pygame.draw.circle(surface, element_color, 
+                         (screen_x + 35, screen_y + 10), 5)
+
+
+def paint_element_dot(surface, element_color):
+    pygame.draw.circle(surface, element_color, (ELEMENT_DOT_RADIUS, ELEMENT_DOT_RADIUS), ELEMENT_DOT_RADIUS)
+
 
 class Player:
     def __init__(self, x, y):
@@ -43,33 +111,32 @@ class Player:
         self.special_cooldown_max = 600
         self.special_attack_type = 0  # 0=base, 1=mega, 2=ultra
         
-        # Load animation sprites
+        # Animation sprites are loaded on first draw, once the atlas has streamed in
         self.sprites = {
             'idle': [],
             'walking': []
         }
+        self.sprites_loaded = None
         
+        # Couleurs pour le dessin (fallback)
+        self.body_color = (100, 150, 255)
+        self.head_color = (255, 220, 180)
+    
+    def load_sprites(self):
+        # Load animation sprites (left/right variants are precomputed by the cache)
         try:
             # Load idle sprite
-            idle_sprite = pygame.image.load('Assets/player_idle.png').convert_alpha()
-            idle_sprite = pygame.transform.scale(idle_sprite, (self.width, self.height))
-            self.sprites['idle'].append(idle_sprite)
+            self.sprites['idle'] = sprite_cache.load_frames(['Assets/player_idle.png'], (self.width, self.height))
             
-            # Load walking sprites
-            for i in range(1, 4):  # 3 walking frames
-                walk_sprite = pygame.image.load(f'Assets/player_walk_{i}.png').convert_alpha()
-                walk_sprite = pygame.transform.scale(walk_sprite, (self.width, self.height))
-                self.sprites['walking'].append(walk_sprite)
+            # Load walking sprites (3 walking frames)
+            self.sprites['walking'] = sprite_cache.load_frames([f'Assets/player_walk_{i}.png' for i in range(1, 4)],
+                                                               (self.width, self.height))
             
             self.sprites_loaded = True
         except Exception as e:
             # Fallback if images not found
             print(f"Error loading sprites: {e}")
             self.sprites_loaded = False
-        
-        # Couleurs pour le dessin (fallback)
-        self.body_color = (100, 150, 255)
-        self.head_color = (255, 220, 180)
     
     def unlock_element(self, element):
         self.elements.add(element)
@@ -218,6 +285,20 @@ class Player:
         self.hp = min(self.max_hp, self.hp + amount)
         return self.hp - old_hp
     
+    def get_element_color(self):
+        """Couleur de l'indicateur d'élément actif (None sans élément débloqué)"""
+        if len(self.elements) <= 1:
+            return None
+        if Element.FEU in self.elements:
+            return (255, 100, 30)
+        elif Element.AIR in self.elements:
+            return (200, 230, 255)
+        elif Element.TERRE in self.elements:
+            return (139, 90, 43)
+        elif Element.EAU in self.elements:
+            return (50, 150, 255)
+        return None
+    
     def draw(self, screen, camera_x, camera_y):
         screen_x = int(self.x - camera_x)
         screen_y = int(self.y - camera_y)
@@ -226,93 +307,28 @@ class Player:
         if self.invincible_frames > 0 and self.invincible_frames % 10 < 5:
             return
         
+        if self.sprites_loaded is None:
+            self.load_sprites()
+        
+        element_color = self.get_element_color()
+        
         # Si les sprites sont chargés, les utiliser
         if self.sprites_loaded and len(self.sprites[self.animation_state]) > 0:
-            # Get the current sprite based on animation state and frame
-            current_sprite = self.sprites[self.animation_state][self.animation_frame]
+            # Get the current sprite based on animation state, frame and direction
+            current_sprite = self.sprites[self.animation_state].get(self.animation_frame,
+                                                                    self.direction == Direction.LEFT)
             
-            # Flip sprite based on direction
-            sprite_to_draw = current_sprite
-            if self.direction == Direction.LEFT:
-                sprite_to_draw = pygame.transform.flip(current_sprite, True, False)
-            
-            screen.blit(sprite_to_draw, (screen_x, screen_y))
+            screen.blit(current_sprite, (screen_x, screen_y))
             
             # Indicateur d'élément actif
-            if len(self.elements) > 1:
-                element_color = None
-                if Element.FEU in self.elements:
-                    element_color = (255, 100, 30)
-                elif Element.AIR in self.elements:
-                    element_color = (200, 230, 255)
-                elif Element.TERRE in self.elements:
-                    element_color = (139, 90, 43)
-                elif Element.EAU in self.elements:
-                    element_color = (50, 150, 255)
-                
-                if element_color:
-                    pygame.draw.circle(screen, element_color, 
-                                     (screen_x + 35, screen_y + 10), 5)
+            if element_color:
+                size = (ELEMENT_DOT_RADIUS * 2, ELEMENT_DOT_RADIUS * 2)
+                dot = sprite_baker.bake(('element_dot', element_color), size, paint_element_dot, element_color)
+                screen.blit(dot, (screen_x + 35 - ELEMENT_DOT_RADIUS, screen_y + 10 - ELEMENT_DOT_RADIUS))
         else:
-            # Fallback: dessiner le personnage avec des formes géométriques
-            walk_offset = 0
-            if self.is_moving:
-                walk_offset = math.sin(self.animation_frame * math.pi / 2) * 3
-            
-            # Corps
-            body_rect = pygame.Rect(screen_x + 10, screen_y + 20, 20, 25)
-            pygame.draw.rect(screen, self.body_color, body_rect)
-            pygame.draw.rect(screen, BLACK, body_rect, 2)
-            
-            # Tête
-            pygame.draw.circle(screen, self.head_color, 
-                             (screen_x + 20, int(screen_y + 15 + walk_offset)), 12)
-            pygame.draw.circle(screen, BLACK, 
-                             (screen_x + 20, int(screen_y + 15 + walk_offset)), 12, 2)
-            
-            # Yeux
-            eye_y = int(screen_y + 13 + walk_offset)
-            pygame.draw.circle(screen, BLACK, (screen_x + 16, eye_y), 2)
-            pygame.draw.circle(screen, BLACK, (screen_x + 24, eye_y), 2)
-            
-            # Bras
-            if self.direction == Direction.RIGHT:
-                pygame.draw.line(screen, self.head_color, 
-                               (screen_x + 30, screen_y + 30), 
-                               (screen_x + 38, screen_y + 35), 4)
-            elif self.direction == Direction.LEFT:
-                pygame.draw.line(screen, self.head_color,
-                               (screen_x + 10, screen_y + 30),
-                               (screen_x + 2, screen_y + 35), 4)
-            else:
-                pygame.draw.line(screen, self.head_color,
-                               (screen_x + 10, screen_y + 30),
-                               (screen_x + 5, screen_y + 38), 4)
-                pygame.draw.line(screen, self.head_color,
-                               (screen_x + 30, screen_y + 30),
-                               (screen_x + 35, screen_y + 38), 4)
-            
-            # Jambes
-            leg_offset = int(walk_offset * 2)
-            pygame.draw.line(screen, BLUE,
-                           (screen_x + 15, screen_y + 45),
-                           (screen_x + 13, screen_y + 60 + leg_offset), 4)
-            pygame.draw.line(screen, BLUE,
-                           (screen_x + 25, screen_y + 45),
-                           (screen_x + 27, screen_y + 60 - leg_offset), 4)
-            
-            # Indicateur d'élément actif
-            if len(self.elements) > 1:
-                element_color = None
-                if Element.FEU in self.elements:
-                    element_color = (255, 100, 30)
-                elif Element.AIR in self.elements:
-                    element_color = (200, 230, 255)
-                elif Element.TERRE in self.elements:
-                    element_color = (139, 90, 43)
-                elif Element.EAU in self.elements:
-                    element_color = (50, 150, 255)
-                
-                if element_color:
-                    pygame.draw.circle(screen, element_color, 
-                                     (screen_x + 35, screen_y + 10), 5)
+            # Fallback: personnage géométrique, rendu une seule fois par pose
+            walk_phase = self.animation_frame if self.is_moving else None
+            sprite = sprite_baker.bake(('player', self.body_color, self.head_color, self.direction, walk_phase, element_color),
+                                       FALLBACK_SIZE, paint_player_fallback,
+                                       self.body_color, self.head_color, self.direction, walk_phase, element_color)
+            screen.blit(sprite, (screen_x - FALLBACK_PADDING, screen_y - FALLBACK_PADDING))
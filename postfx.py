@@ -0,0 +1,206 @@
+import random
+import time
+import numpy as np
+import pygame
+
+# Effets d'écran appliqués sur la frame finale, directement dans ses pixels (vue pixels2d, sans copie).
+# Les pixels 32 bits sont traités deux canaux à la fois (rouge+bleu, puis vert) en entiers:
+# p = (p * (256 - a) + c * a) >> 8, ce qui évite la vue pixels3d (un octet par élément), bien plus lente.
+RB_MASK = 0xFF00FF
+G_MASK = 0x00FF00
+
+
+def supports_pixels(surface):
+    """Vrai si les canaux R, V, B occupent les 24 bits de poids faible d'un pixel 32 bits"""
+    masks = surface.get_masks()
+    return surface.get_bitsize() == 32 and (masks[0] | masks[1] | masks[2]) == 0xFFFFFF
+
+
+def new_buffers(pixels):
+    """Tampons de travail (rouge+bleu, vert) de la taille de la vue"""
+    return np.empty_like(pixels), np.empty_like(pixels)
+
+
+def blend_pixels(pixels, buffers, color, amount):
+    """Mélange en place les pixels (vue pixels2d) vers `color` (couleur déjà au format de la surface) ; amount de 0 à 256"""
+    rb, g = buffers
+    keep = 256 - amount
+    np.bitwise_and(pixels, RB_MASK, out=rb)
+    np.multiply(rb, keep, out=rb)
+    np.add(rb, (color & RB_MASK) * amount, out=rb)
+    np.right_shift(rb, 8, out=rb)
+    np.bitwise_and(rb, RB_MASK, out=rb)
+    np.bitwise_and(pixels, G_MASK, out=g)
+    np.multiply(g, keep, out=g)
+    np.add(g, (color & G_MASK) * amount, out=g)
+    np.right_shift(g, 8, out=g)
+    np.bitwise_and(g, G_MASK, out=g)
+    np.bitwise_or(rb, g, out=pixels)
+
+
+def dim_surface(surface, color, alpha):
+    """Assombrit une fois une surface (voile d'un overlay) ; alpha de 0 à 255 comme set_alpha"""
+    if not supports_pixels(surface):
+        veil = pygame.Surface(surface.get_size())
+        veil.set_alpha(alpha)
+        veil.fill(color)
+        surface.blit(veil, (0, 0))
+        return
+    pixels = pygame.surfarray.pixels2d(surface)
+    blend_pixels(pixels, new_buffers(pixels), surface.map_rgb(color), alpha * 256 // 255)
+    del pixels  # Libère le verrou de la surface
+
+
+class PostEffect:
+    """Effet d'écran ; duration None = permanent tant qu'il est activé"""
+    name = None
+    uses_pixels = True  # Travaille sur la vue pixels2d (sinon sur la surface)
+
+    def __init__(self):
+        self.enabled = True
+        self.remaining = 0
+        self.duration = 0
+        self.permanent = False
+        self.last_ms = 0.0
+        self.total_ms = 0.0
+        self.frames = 0
+
+    def trigger(self, duration=None):
+        if duration is None:
+            self.permanent = True
+        else:
+            self.permanent = False
+            self.duration = self.remaining = duration
+
+    def stop(self):
+        self.permanent = False
+        self.remaining = 0
+
+    def active(self):
+        return self.enabled and (self.permanent or self.remaining > 0)
+
+    def progress(self):
+        """1 au déclenchement, décroît jusqu'à 0 à la fin de l'effet"""
+        if self.permanent or not self.duration:
+            return 1.0
+        return self.remaining / self.duration
+
+    def tick(self):
+        if self.remaining > 0:
+            self.remaining -= 1
+
+
+class ScreenShake(PostEffect):
+    """Tremblement: la frame est décalée en place (Surface.scroll), amplitude décroissante"""
+    name = 'shake'
+    uses_pixels = False
+
+    def __init__(self, amplitude=8):
+        super().__init__()
+        self.amplitude = amplitude
+
+    def apply(self, surface, pixels, buffers):
+        amplitude = max(1, int(self.amplitude * self.progress()))
+        surface.scroll(random.randint(-amplitude, amplitude), random.randint(-amplitude, amplitude))
+
+
+class ColorFlash(PostEffect):
+    """Flash de couleur (coup reçu, attaque spéciale), estompé sur sa durée"""
+    name = 'flash'
+
+    def __init__(self):
+        super().__init__()
+        self.color = (255, 255, 255)
+        self.strength = 128
+
+    def set_color(self, color, strength):
+        self.color = color
+        self.strength = strength
+
+    def apply(self, surface, pixels, buffers):
+        blend_pixels(pixels, buffers, surface.map_rgb(self.color), int(self.strength * self.progress()))
+
+
+class ColorGrade(PostEffect):
+    """Teinte légère de l'image selon l'élément du royaume"""
+    name = 'grade'
+
+    def __init__(self, strength=24):
+        super().__init__()
+        self.color = None
+        self.strength = strength
+
+    def set_color(self, color):
+        self.color = color
+
+    def active(self):
+        return super().active() and self.color is not None
+
+    def apply(self, surface, pixels, buffers):
+        blend_pixels(pixels, buffers, surface.map_rgb(self.color), self.strength)
+
+
+class PostEffects:
+    """Chaîne d'effets: chacun activable, minuté et chronométré ; tampons de travail alloués une fois"""
+    def __init__(self, surface, effects=None):
+        self.surface = surface
+        self.effects = {}
+        for effect in effects or (ScreenShake(), ColorGrade(), ColorFlash()):
+            self.effects[effect.name] = effect
+        self.buffers = None  # Tampons de la taille de l'écran, alloués au premier effet de couleur
+        self.last_ms = 0.0
+        
+        # Format de pixels non géré: seuls les effets géométriques restent disponibles
+        if not supports_pixels(surface):
+            print(f"Warning: format d'écran {surface.get_bitsize()} bits non géré, effets de couleur désactivés")
+            for effect in self.effects.values():
+                if effect.uses_pixels:
+                    effect.enabled = False
+
+    def get(self, name):
+        return self.effects[name]
+
+    def set_enabled(self, name, enabled):
+        self.effects[name].enabled = enabled
+
+    def apply(self):
+        """Applique les effets actifs, dans l'ordre de la chaîne, sur la frame déjà dessinée"""
+        active = [effect for effect in self.effects.values() if effect.active()]
+        self.last_ms = 0.0
+        if not active:
+            return
+
+        # Les effets géométriques d'abord: Surface.scroll ne peut pas travailler sur une surface verrouillée
+        for effect in active:
+            if not effect.uses_pixels:
+                self.run(effect, None)
+
+        if any(effect.uses_pixels for effect in active):
+            pixels = pygame.surfarray.pixels2d(self.surface)
+            if self.buffers is None or self.buffers[0].shape != pixels.shape:
+                self.buffers = new_buffers(pixels)
+            for effect in active:
+                if effect.uses_pixels:
+                    self.run(effect, pixels)
+            del pixels  # Libère le verrou avant l'affichage
+
+    def run(self, effect, pixels):
+        start = time.perf_counter()
+        effect.apply(self.surface, pixels, self.buffers)
+        effect.tick()
+        effect.last_ms = (time.perf_counter() - start) * 1000
+        effect.total_ms += effect.last_ms
+        effect.frames += 1
+        self.last_ms += effect.last_ms
+
+    def get_stats(self):
+        """Coût de chaque effet: dernière frame et moyenne, en millisecondes"""
+        return {
+            name: {
+                'enabled': effect.enabled,
+                'active': effect.active(),
+                'last_ms': effect.last_ms,
+                'avg_ms': effect.total_ms / effect.frames if effect.frames else 0.0
+            }
+            for name, effect in self.effects.items()
+        }
@@ -1,6 +1,58 @@
+import math
 import pygame
 from enums import Direction, Element
 from constants import WHITE
+from sprites import sprite_cache, sprite_baker
+from quality import quality
+
+
+def paint_projectile_fallback(surface, color, size):
+    """Boule simple avec contour blanc"""
+    center = (size + 1, size + 1)
+    pygame.draw.circle(surface, color, center, size)
+    pygame.draw.circle(surface, WHITE, center, size, 2)
+
+
+# Frames des attaques spéciales: la pulsation et la rotation ne prennent qu'un nombre fini de
+# valeurs (taille arrondie, rotation modulo la symétrie de l'étoile), chaque frame est rendue une fois
+
+def paint_special_frame(surface, color, glow_color, current_size, glow_layers):
+    """Halo (limité à la surface de 4x la taille, comme avant), boule, contour et centre"""
+    center = (current_size * 2, current_size * 2)
+    for i in range(glow_layers, 0, -1):
+        alpha = 50 // i
+        glow_size = current_size + (i * 15)
+        pygame.draw.circle(surface, (*glow_color, alpha), center, glow_size)
+    pygame.draw.circle(surface, color, center, current_size)
+    pygame.draw.circle(surface, glow_color, center, current_size, 4)
+    pygame.draw.circle(surface, (255, 255, 255), center, current_size // 3)
+
+
+def paint_mega_frame(surface, color, glow_color, current_size, rotation):
+    """Étoile à 6 branches et cercle central"""
+    center = surface.get_width() // 2
+    for i in range(6):
+        angle = math.radians(rotation + i * 60)
+        end_x = center + math.cos(angle) * current_size
+        end_y = center + math.sin(angle) * current_size
+        pygame.draw.line(surface, (*glow_color, 150), (center, center), (end_x, end_y), 6)
+    pygame.draw.circle(surface, color, (center, center), current_size // 2)
+    pygame.draw.circle(surface, (255, 255, 255), (center, center), current_size // 4)
+
+
+def paint_ultra_rings(surface, colors, current_size):
+    """Anneaux concentriques multicolores"""
+    center = surface.get_width() // 2
+    for i, color in enumerate(colors):
+        ring_size = current_size - (i * 12)
+        if ring_size > 0:
+            pygame.draw.circle(surface, color, (center, center), ring_size, 8)
+
+
+def paint_ultra_core(surface, core_size):
+    center = surface.get_width() // 2
+    pygame.draw.circle(surface, (255, 255, 255), (center, center), core_size)
+
 
 class Projectile:
     def __init__(self, x, y, direction, element, damage):
@@ -24,6 +76,14 @@ class Projectile:
             self.color = (200, 230, 255)
         else:
             self.color = (200, 200, 200)
+        
+        # Sprite de boule de feu (sous-surface de l'atlas si disponible)
+        self.sprite = None
+        if element == Element.FEU:
+            try:
+                self.sprite = sprite_cache.load('Assets/projectile_fire.png', (self.size * 2, self.size * 2))
+            except:
+                self.sprite = None
     
     def update(self):
         if self.direction == Direction.RIGHT:
@@ -40,11 +100,19 @@ class Projectile:
     def draw(self, screen, camera_x, camera_y):
         screen_x = int(self.x - camera_x)
         screen_y = int(self.y - camera_y)
-        pygame.draw.circle(screen, self.color, (screen_x, screen_y), self.size)
-        pygame.draw.circle(screen, WHITE, (screen_x, screen_y), self.size, 2)
+        if self.sprite:
+            screen.blit(self.sprite, (screen_x - self.size, screen_y - self.size))
+            return
+        half = self.size + 1
+        ball = sprite_baker.bake(('projectile', self.color, self.size), (half * 2, half * 2),
+                                 paint_projectile_fallback, self.color, self.size)
+        screen.blit(ball, (screen_x - half, screen_y - half))
     
     def is_dead(self):
         return self.lifetime <= 0
+    
+    def get_draw_bounds(self):
+        return pygame.Rect(self.x - self.size - 1, self.y - self.size - 1, self.size * 2 + 2, self.size * 2 + 2)
 
 
 class SpecialProjectile:
@@ -87,7 +155,6 @@ class SpecialProjectile:
         self.pulse_timer += 1
     
     def draw(self, screen, camera_x, camera_y):
-        import math
         screen_x = int(self.x - camera_x)
         screen_y = int(self.y - camera_y)
         
@@ -95,24 +162,20 @@ class SpecialProjectile:
         pulse = abs(math.sin(self.pulse_timer * 0.2)) * 10
         current_size = int(self.size + pulse)
         
-        # Halo externe (glow)
-        glow_surface = pygame.Surface((current_size * 4, current_size * 4), pygame.SRCALPHA)
-        for i in range(3, 0, -1):
-            alpha = 50 // i
-            glow_size = current_size + (i * 15)
-            pygame.draw.circle(glow_surface, (*self.glow_color, alpha), 
-                             (current_size * 2, current_size * 2), glow_size)
-        screen.blit(glow_surface, (screen_x - current_size * 2, screen_y - current_size * 2))
-        
-        # Boule principale
-        pygame.draw.circle(screen, self.color, (screen_x, screen_y), current_size)
-        # Contour lumineux
-        pygame.draw.circle(screen, self.glow_color, (screen_x, screen_y), current_size, 4)
-        # Centre blanc brillant
-        pygame.draw.circle(screen, (255, 255, 255), (screen_x, screen_y), current_size // 3)
+        # Halo et boule pré-rendus par taille (moins de couches de halo sur les paliers légers)
+        glow_layers = quality.tier['glow_layers']
+        frame = sprite_baker.bake(('special', self.color, self.glow_color, current_size, glow_layers),
+                                  (current_size * 4, current_size * 4),
+                                  paint_special_frame, self.color, self.glow_color, current_size, glow_layers)
+        screen.blit(frame, (screen_x - current_size * 2, screen_y - current_size * 2))
     
     def is_dead(self):
         return self.lifetime <= 0
+    
+    def get_draw_bounds(self):
+        # Halo de 4x la taille maximale de la pulsation (+10)
+        half = (self.size + 10) * 2
+        return pygame.Rect(self.x - half, self.y - half, half * 2, half * 2)
 
 
 class MegaProjectile:
@@ -144,32 +207,27 @@ class MegaProjectile:
         self.rotation += 10
     
     def draw(self, screen, camera_x, camera_y):
-        import math
         screen_x = int(self.x - camera_x)
         screen_y = int(self.y - camera_y)
         
         pulse = abs(math.sin(self.pulse_timer * 0.15)) * 15
         current_size = int(self.size + pulse)
         
-        # Étoile rotative
-        glow_surface = pygame.Surface((current_size * 4, current_size * 4), pygame.SRCALPHA)
-        center = current_size * 2
-        
-        # Dessiner une étoile à 6 branches
-        for i in range(6):
-            angle = math.radians(self.rotation + i * 60)
-            end_x = center + math.cos(angle) * current_size
-            end_y = center + math.sin(angle) * current_size
-            pygame.draw.line(glow_surface, (*self.glow_color, 150), (center, center), (end_x, end_y), 6)
-        
-        screen.blit(glow_surface, (screen_x - center, screen_y - center))
-        
-        # Cercle central
-        pygame.draw.circle(screen, self.color, (screen_x, screen_y), current_size // 2)
-        pygame.draw.circle(screen, (255, 255, 255), (screen_x, screen_y), current_size // 4)
+        # Étoile rotative: symétrique tous les 60°, une frame par (taille, rotation % 60)
+        rotation = self.rotation % 60
+        half = current_size + 4
+        frame = sprite_baker.bake(('mega', self.color, self.glow_color, current_size, rotation),
+                                  (half * 2, half * 2),
+                                  paint_mega_frame, self.color, self.glow_color, current_size, rotation)
+        screen.blit(frame, (screen_x - half, screen_y - half))
     
     def is_dead(self):
         return self.lifetime <= 0
+    
+    def get_draw_bounds(self):
+        # Étoile dans une surface de 4x la taille maximale de la pulsation (+15)
+        half = (self.size + 15) * 2
+        return pygame.Rect(self.x - half, self.y - half, half * 2, half * 2)
 
 
 class UltraProjectile:
@@ -198,7 +256,6 @@ class UltraProjectile:
         self.pulse_timer += 1
     
     def draw(self, screen, camera_x, camera_y):
-        import math
         screen_x = int(self.x - camera_x)
         screen_y = int(self.y - camera_y)
         
@@ -206,14 +263,22 @@ class UltraProjectile:
         current_size = int(self.size + pulse)
         
         # Anneaux concentriques multicolores
-        for i, color in enumerate(self.colors):
-            ring_size = current_size - (i * 12)
-            if ring_size > 0:
-                pygame.draw.circle(screen, color, (screen_x, screen_y), ring_size, 8)
+        half = current_size + 1
+        rings = sprite_baker.bake(('ultra', tuple(self.colors), current_size), (half * 2, half * 2),
+                                  paint_ultra_rings, self.colors, current_size)
+        screen.blit(rings, (screen_x - half, screen_y - half))
         
-        # Centre blanc brillant qui pulse
+        # Centre blanc brillant qui pulse (sa propre période: frames séparées des anneaux)
         core_size = int(20 + abs(math.sin(self.pulse_timer * 0.3)) * 10)
-        pygame.draw.circle(screen, (255, 255, 255), (screen_x, screen_y), core_size)
+        core_half = core_size + 1
+        core = sprite_baker.bake(('ultra_core', core_size), (core_half * 2, core_half * 2),
+                                 paint_ultra_core, core_size)
+        screen.blit(core, (screen_x - core_half, screen_y - core_half))
     
     def is_dead(self):
         return self.lifetime <= 0
+    
+    def get_draw_bounds(self):
+        # Anneau extérieur à la taille maximale de la pulsation (+20)
+        half = self.size + 21
+        return pygame.Rect(self.x - half, self.y - half, half * 2, half * 2)
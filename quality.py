@@ -0,0 +1,91 @@
+from collections import deque
+from constants import FPS, QUALITY_ADAPTIVE
+
+# Paliers de qualité, du plus beau au plus léger
+QUALITY_TIERS = [
+    {'name': 'haute', 'particle_scale': 1.0, 'glow_layers': 3, 'video_frame_step': 1,
+     'color_grade': True, 'smooth_upscale': True},
+    {'name': 'moyenne', 'particle_scale': 0.6, 'glow_layers': 2, 'video_frame_step': 1,
+     'color_grade': False, 'smooth_upscale': True},
+    {'name': 'basse', 'particle_scale': 0.35, 'glow_layers': 1, 'video_frame_step': 2,
+     'color_grade': False, 'smooth_upscale': False},
+    {'name': 'minimale', 'particle_scale': 0.2, 'glow_layers': 0, 'video_frame_step': 3,
+     'color_grade': False, 'smooth_upscale': False}
+]
+
+
+class QualityController:
+    """Suit le temps de calcul moyen des frames et change de palier de qualité, avec hystérésis"""
+    def __init__(self, budget_ms=1000 / FPS, window=60, enabled=QUALITY_ADAPTIVE):
+        self.budget_ms = budget_ms
+        self.enabled = enabled
+        self.samples = deque(maxlen=window)  # Temps de calcul des dernières frames (ms)
+        self.total_ms = 0.0
+        self.tier_index = 0
+        self.changes = 0
+        self.last_average = 0.0  # Moyenne de la dernière fenêtre évaluée
+
+        # Descendre dès que le budget est dépassé ; remonter seulement avec une vraie marge,
+        # sur plusieurs fenêtres de suite, pour ne pas osciller entre deux paliers
+        self.down_ratio = 0.95
+        self.up_ratio = 0.6
+        self.up_windows = 3
+        self.good_windows = 0
+
+    @property
+    def tier(self):
+        return QUALITY_TIERS[self.tier_index]
+
+    def average_ms(self):
+        return self.total_ms / len(self.samples) if self.samples else 0.0
+
+    def record(self, frame_ms):
+        """Ajoute le temps de calcul d'une frame ; True si le palier a changé"""
+        if not self.enabled:
+            return False
+        self.samples.append(frame_ms)
+        self.total_ms += frame_ms
+        if len(self.samples) < self.samples.maxlen:
+            return False
+
+        # Fenêtre complète: décision, puis nouvelle fenêtre
+        self.last_average = self.average_ms()
+        self.samples.clear()
+        self.total_ms = 0.0
+        if self.last_average > self.budget_ms * self.down_ratio:
+            self.good_windows = 0
+            return self.set_tier(self.tier_index + 1)
+        if self.last_average < self.budget_ms * self.up_ratio:
+            self.good_windows += 1
+            if self.good_windows >= self.up_windows:
+                self.good_windows = 0
+                return self.set_tier(self.tier_index - 1)
+        else:
+            self.good_windows = 0
+        return False
+
+    def set_tier(self, index):
+        """True si le palier change (borné au premier et au dernier)"""
+        index = max(0, min(index, len(QUALITY_TIERS) - 1))
+        if index == self.tier_index:
+            return False
+        self.tier_index = index
+        self.changes += 1
+        return True
+
+    def get_stats(self):
+        """Palier courant et temps moyen, pour la télémétrie"""
+        return {
+            'tier': self.tier_index,
+            'name': self.tier['name'],
+            'average_ms': self.last_average,
+            'budget_ms': self.budget_ms,
+            'changes': self.changes
+        }
+
+    def report(self):
+        return f"Qualité: {self.tier['name']} ({self.last_average:.1f} ms/frame, budget {self.budget_ms:.1f} ms)"
+
+
+# Palier partagé par tout le jeu (particules, projectiles, vidéo, effets)
+quality = QualityController()
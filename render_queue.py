@@ -0,0 +1,60 @@
+from display_format import format_audit
+
+# Couches de la scène de jeu, de la plus basse à la plus haute
+LAYERS = ('background', 'enemies', 'projectiles', 'particles', 'player', 'hud', 'ui')
+
+
+class RenderLayer:
+    """Commandes de dessin d'une couche ; même interface blit()/fill() qu'une Surface"""
+    def __init__(self, name):
+        self.name = name
+        self.fills = []  # (couleur, rect), dessinés sous les blits de la couche
+        self.commands = []  # (surface, position, zone source, flags)
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        self.commands.append((source, dest, area, special_flags))
+
+    def fill(self, color, rect=None):
+        self.fills.append((color, rect))
+
+
+class RenderQueue:
+    """File de rendu par couches: chaque couche est envoyée à l'écran en un seul Surface.blits"""
+    def __init__(self, target, layers=LAYERS):
+        self.target = target
+        self.layers = {name: RenderLayer(name) for name in layers}
+
+        # Statistiques de la dernière frame
+        self.last_commands = 0
+        self.last_batches = 0
+        self.last_layer_commands = {name: 0 for name in layers}
+
+    def layer(self, name):
+        return self.layers[name]
+
+    def flush(self):
+        """Dessine toutes les couches dans l'ordre puis vide la file"""
+        self.last_commands = 0
+        self.last_batches = 0
+        for name, layer in self.layers.items():
+            for color, rect in layer.fills:
+                self.target.fill(color, rect)
+            if layer.commands:
+                if format_audit.enabled:
+                    for command in layer.commands:
+                        format_audit.check(command[0], f"{name} {command[0].get_size()}")
+                self.target.blits(layer.commands, doreturn=False)
+                self.last_batches += 1
+            count = len(layer.fills) + len(layer.commands)
+            self.last_layer_commands[name] = count
+            self.last_commands += count
+            layer.fills.clear()
+            layer.commands.clear()
+
+    def get_stats(self):
+        """Commandes de dessin et appels blits() de la dernière frame"""
+        return {
+            'commands': self.last_commands,
+            'batches': self.last_batches,
+            'layers': dict(self.last_layer_commands)
+        }
@@ -0,0 +1,61 @@
+import pygame
+from display_format import new_surface, format_audit
+
+
+class RenderTarget:
+    """Surface où le jeu est dessiné: l'écran lui-même, ou une surface hors écran à la résolution
+    interne, agrandie une seule fois par frame au moment de l'affichage"""
+    def __init__(self, display, resolution=None, smooth=True):
+        self.display = display
+        self.smooth = smooth
+        display_size = display.get_size()
+        if resolution is None or tuple(resolution) == display_size:
+            self.surface = display
+            self.offscreen = False
+        else:
+            self.surface = new_surface(tuple(resolution))
+            self.offscreen = True
+
+        # Facteurs écran réel / résolution interne (conversion souris et zones modifiées)
+        self.factor_x = display_size[0] / self.surface.get_width()
+        self.factor_y = display_size[1] / self.surface.get_height()
+        self.upscales = 0
+
+    def upscale(self):
+        """Agrandit la frame interne dans la surface de l'écran, sans allocation"""
+        format_audit.check(self.surface, 'render_target')
+        if self.smooth:
+            pygame.transform.smoothscale(self.surface, self.display.get_size(), self.display)
+        else:
+            pygame.transform.scale(self.surface, self.display.get_size(), self.display)
+        self.upscales += 1
+
+    def flip(self):
+        if self.offscreen:
+            self.upscale()
+        pygame.display.flip()
+
+    def update(self, rects):
+        """Envoie seulement les zones modifiées (en coordonnées internes)"""
+        if not self.offscreen:
+            pygame.display.update(rects)
+            return
+        self.upscale()
+        # +1 pixel de chaque côté: le filtrage de l'agrandissement déborde des zones
+        pygame.display.update([self.to_display_rect(rect).inflate(2, 2) for rect in rects])
+
+    def to_display_rect(self, rect):
+        left = int(rect.left * self.factor_x)
+        top = int(rect.top * self.factor_y)
+        right = int(rect.right * self.factor_x + 0.999)
+        bottom = int(rect.bottom * self.factor_y + 0.999)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def to_render(self, pos):
+        """Position écran réel -> position dans la surface de rendu"""
+        if not self.offscreen:
+            return pos
+        return int(pos[0] / self.factor_x), int(pos[1] / self.factor_y)
+
+    def mouse_pos(self):
+        return self.to_render(pygame.mouse.get_pos())
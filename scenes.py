@@ -0,0 +1,155 @@
+import pygame
+from enums import GameState
+from postfx import dim_surface
+
+
+class Scene:
+    """Un écran du jeu avec ses propres événements, mise à jour et dessin"""
+    state = None
+    opens_over = ()  # États au-dessus desquels la scène s'ouvre en overlay (sinon elle remplace la pile)
+
+    def __init__(self, game):
+        self.game = game
+        self.below = None  # Scène recouverte quand la scène est un overlay
+
+    def enter(self, below=None):
+        self.below = below
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, keys):
+        pass
+
+    def draw(self):
+        pass
+
+
+class OverlayScene(Scene):
+    """Overlay: la scène du dessous est figée en une image, assombrie une seule fois"""
+    dim_color = (0, 0, 0)
+    dim_alpha = 180
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.frame = None  # Dernière image de la scène de jeu figée
+        self.background = None  # La même, assombrie
+
+    def enter(self, below=None):
+        super().enter(below)
+        if below is None:
+            return
+        self.frame = self.game.screen.copy()
+        self.background = self.frame.copy()
+        dim_surface(self.background, self.dim_color, self.dim_alpha)
+
+
+class LoadingScene(Scene):
+    state = GameState.LOADING
+
+    def draw(self):
+        self.game.draw_loading()
+
+
+class MenuScene(Scene):
+    state = GameState.MENU
+
+    def draw(self):
+        self.game.draw_menu()
+
+
+class GameScene(Scene):
+    state = GameState.GAME
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.game.change_state(GameState.PAUSED)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.game.handle_double_click()
+
+    def update(self, keys):
+        self.game.update_game(keys)
+
+    def draw(self):
+        self.game.draw_game()
+
+
+class PauseScene(OverlayScene):
+    state = GameState.PAUSED
+    opens_over = (GameState.GAME,)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.game.change_state(GameState.GAME)
+
+    def draw(self):
+        self.game.draw_pause(self.background)
+
+
+class ShopScene(Scene):
+    state = GameState.SHOP
+
+    def draw(self):
+        self.game.draw_shop()
+
+
+class SettingsScene(Scene):
+    state = GameState.SETTINGS
+
+    def handle_event(self, event):
+        if self.game.waiting_for_key and event.type == pygame.KEYDOWN:
+            self.game.assign_key(event.key)
+
+    def draw(self):
+        self.game.draw_settings()
+
+
+class VictoryScene(Scene):
+    state = GameState.VICTORY
+
+    def draw(self):
+        self.game.draw_victory()
+
+
+class GameOverScene(Scene):
+    state = GameState.GAME_OVER
+
+    def draw(self):
+        self.game.draw_game_over()
+
+
+SCENES = {scene.state: scene for scene in (LoadingScene, MenuScene, GameScene, PauseScene, ShopScene,
+                                           SettingsScene, VictoryScene, GameOverScene)}
+
+
+class SceneStack:
+    """Pile de scènes: seule la scène du sommet reçoit les événements, est mise à jour et dessinée"""
+    def __init__(self, game):
+        self.game = game
+        self.scenes = []
+
+    @property
+    def top(self):
+        return self.scenes[-1] if self.scenes else None
+
+    def change(self, state):
+        """Revient à l'état s'il est déjà dans la pile, l'ouvre en overlay si possible, sinon remplace la pile"""
+        for i, scene in enumerate(self.scenes):
+            if scene.state == state:
+                del self.scenes[i + 1:]
+                return
+        scene = SCENES[state](self.game)
+        below = self.top
+        if below is not None and below.state in scene.opens_over:
+            scene.enter(below)
+        else:
+            self.scenes.clear()
+            scene.enter()
+        self.scenes.append(scene)
+
+    def back(self, default):
+        """Ferme l'overlay du sommet, ou passe à `default` si la scène n'en est pas un"""
+        if self.top is not None and self.top.below is not None:
+            self.scenes.pop()
+        else:
+            self.change(default)
@@ -0,0 +1,168 @@
+import pygame
+import asset_cache
+from atlas import texture_atlas
+from display_format import ingest, new_surface
+from asset_registry import asset_registry
+
+
+class SpriteFrames:
+    """Frames d'une animation avec leurs variantes gauche/droite, calculées une seule fois"""
+    def __init__(self, frames, left_frames=None):
+        self.right = list(frames)
+        if left_frames is None:
+            left_frames = [pygame.transform.flip(frame, True, False) for frame in self.right]
+        self.left = list(left_frames)
+
+    def __len__(self):
+        return len(self.right)
+
+    def get(self, index, facing_left=False):
+        return self.left[index] if facing_left else self.right[index]
+
+
+class AnimationClock:
+    """Horloge d'animation partagée, avancée une seule fois par frame de jeu"""
+    def __init__(self):
+        self.ticks = 0
+
+    def tick(self):
+        self.ticks += 1
+
+    def frame_index(self, frame_count, frame_duration, phase=0):
+        """Index de frame pour une instance décalée de `phase` ticks"""
+        return ((self.ticks + phase) // frame_duration) % frame_count
+
+
+class SpriteCache:
+    """Cache partagé des sprites, indexé par (chemin, taille cible)"""
+    def __init__(self):
+        self.sources = {}  # chemin -> surface décodée (taille d'origine)
+        self.surfaces = {}  # (chemin, taille, retourné) -> surface redimensionnée
+        self.failures = {}  # chemin -> message d'erreur de chargement (évite de retenter le disque)
+        self.frame_sets = {}  # (chemins, taille) -> SpriteFrames partagé entre instances
+        self.resolution = None  # Taille de la surface de rendu: dossier du cache disque préparé par le jeu
+
+        # Compteurs pour vérifier qu'un redémarrage ne relit rien sur le disque
+        self.disk_loads = 0
+        self.atlas_hits = 0
+        self.hits = 0
+        self.misses = 0
+        self.failed_loads = 0  # Chargements en échec (premier essai et échecs déjà connus)
+
+    def set_resolution(self, resolution):
+        self.resolution = tuple(resolution)
+
+    def load(self, path, size=None, flipped=False):
+        """Retourne le sprite (converti avec alpha) à la taille demandée"""
+        key = (path, size, flipped)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        # Sous-surface de l'atlas si le sprite y a été empaqueté
+        surface = texture_atlas.get(path, size, flipped)
+        if surface is not None:
+            self.misses += 1
+            self.atlas_hits += 1
+            self.surfaces[key] = surface
+            return surface
+
+        if flipped:
+            surface = pygame.transform.flip(self.load(path, size), True, False)
+            self.surfaces[key] = surface
+            asset_registry.put(('sprite',) + key, 'sprites', surface)
+            return surface
+
+        if path in self.failures:
+            # Échec déjà connu : on ne retourne pas sur le disque. Nouvelle exception à chaque fois:
+            # relancer la même accumulerait les tracebacks (et garderait en vie tous les appelants)
+            self.failed_loads += 1
+            raise pygame.error(self.failures[path])
+
+        if size is not None:
+            # Pixels déjà redimensionnés par le cache disque (préparé pour la résolution de rendu)
+            resolution = self.resolution or pygame.display.get_surface().get_size()
+            try:
+                surface = asset_cache.load_image(path, size, True, resolution)
+            except Exception as e:
+                self.failures[path] = str(e)
+                self.failed_loads += 1
+                raise
+            self.misses += 1
+            self.disk_loads += 1
+            self.surfaces[key] = surface
+            asset_registry.put(('sprite',) + key, 'sprites', surface)
+            return surface
+
+        source = self.sources.get(path)
+        if source is None:
+            try:
+                source = ingest(pygame.image.load(path), alpha=True)
+            except Exception as e:
+                self.failures[path] = str(e)
+                self.failed_loads += 1
+                raise
+            self.misses += 1
+            self.disk_loads += 1
+            self.sources[path] = source
+            asset_registry.put(('sprite',) + key, 'sprites', source)
+        self.surfaces[key] = source
+        return source
+
+    def load_frames(self, paths, size=None):
+        """Retourne les frames d'une animation, retournées une seule fois pour tout le processus"""
+        key = (tuple(paths), size)
+        frames = self.frame_sets.get(key)
+        if frames is None:
+            frames = SpriteFrames([self.load(path, size) for path in paths],
+                                  [self.load(path, size, flipped=True) for path in paths])
+            self.frame_sets[key] = frames
+        else:
+            self.hits += len(frames)
+        return frames
+
+    def get_stats(self):
+        requests = self.hits + self.misses
+        return {
+            'disk_loads': self.disk_loads,
+            'atlas_hits': self.atlas_hits,
+            'hits': self.hits,
+            'misses': self.misses,
+            'failed_loads': self.failed_loads,
+            'hit_rate': self.hits / requests if requests else 0.0
+        }
+
+    def report(self):
+        stats = self.get_stats()
+        return (f"Sprites: {stats['disk_loads']} chargements disque, {stats['atlas_hits']} depuis l'atlas, "
+                f"{stats['hits']}/{stats['hits'] + stats['misses']} hits ({stats['hit_rate']:.0%}), "
+                f"{stats['failed_loads']} échecs")
+
+
+class SpriteBaker:
+    """Rend une seule fois les dessins géométriques de secours dans une surface en cache"""
+    def __init__(self):
+        self.surfaces = {}  # clé (type, couleur, taille, direction, phase...) -> surface
+        self.bakes = 0
+        self.hits = 0
+
+    def bake(self, key, size, paint, *args):
+        """Retourne la surface de `key`, peinte par paint(surface, *args) au premier appel"""
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        surface = new_surface(size, alpha=True)
+        paint(surface, *args)
+        self.bakes += 1
+        self.surfaces[key] = surface
+        asset_registry.put(('baked',) + key, 'sprites', surface)
+        return surface
+
+
+# Cache unique pour tout le processus (ennemis, joueur...)
+sprite_cache = SpriteCache()
+sprite_baker = SpriteBaker()
+animation_clock = AnimationClock()
@@ -0,0 +1,179 @@
+from collections import OrderedDict
+import pygame
+from asset_registry import asset_registry
+from display_format import ingest, new_surface
+
+TEXT_CACHE_SIZE = 256  # Surfaces de texte gardées au maximum
+LAYOUT_CACHE_SIZE = 64  # Mises en page (retours à la ligne) gardées au maximum
+GLYPH_CHARSET = "0123456789/:%+-.x sOR"  # Caractères des compteurs, rendus une fois par (police, couleur)
+
+
+class FontRegistry:
+    """Polices partagées par (fichier, taille): une seule pygame.font.Font par couple"""
+    def __init__(self):
+        self.fonts = {}
+        self.keys = {}  # police -> (fichier, taille), pour les clés du cache de texte
+
+    def get(self, face=None, size=30):
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(face, size)
+            self.fonts[key] = font
+            self.keys[font] = key
+        return font
+
+    def key(self, font):
+        # Une police créée hors du registre reste utilisable (clé = son identité)
+        return self.keys.get(font, id(font))
+
+
+class TextCache:
+    """Surfaces de texte rendues, éviction LRU ; la mémoire est comptée dans la catégorie 'text' du registre"""
+    def __init__(self, max_entries=TEXT_CACHE_SIZE, max_layouts=LAYOUT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.max_layouts = max_layouts
+        self.surfaces = OrderedDict()  # (police, texte, couleur, antialias) -> Surface
+        self.layouts = OrderedDict()  # (police, texte, largeur) -> lignes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.layout_hits = 0
+        self.layout_misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font_registry.key(font), text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = ingest(font.render(text, antialias, color))
+        self.surfaces[key] = surface
+        asset_registry.put(('text',) + key, 'text', surface)
+        while len(self.surfaces) > self.max_entries:
+            old_key, _ = self.surfaces.popitem(last=False)
+            asset_registry.remove(('text',) + old_key)
+            self.evictions += 1
+        return surface
+
+    def wrap(self, font, text, max_width):
+        """Découpe en lignes plus étroites que max_width (mêmes règles que l'ancien dialogue)"""
+        key = (font_registry.key(font), text, max_width)
+        lines = self.layouts.get(key)
+        if lines is not None:
+            self.layouts.move_to_end(key)
+            self.layout_hits += 1
+            return lines
+
+        self.layout_misses += 1
+        lines = []
+        current_line = ""
+        for word in text.split():
+            test_line = current_line + word + " "
+            if font.size(test_line)[0] < max_width:
+                current_line = test_line
+            else:
+                lines.append(current_line)
+                current_line = word + " "
+        lines.append(current_line)
+        lines = [line.strip() for line in lines]
+
+        self.layouts[key] = lines
+        if len(self.layouts) > self.max_layouts:
+            self.layouts.popitem(last=False)
+        return lines
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'layout_hits': self.layout_hits,
+            'layout_misses': self.layout_misses
+        }
+
+    def report(self):
+        stats = self.get_stats()
+        return (f"Texte: {stats['entries']} surfaces en cache, {stats['hits']}/{stats['hits'] + stats['misses']} "
+                f"hits ({stats['hit_rate']:.0%}), {stats['evictions']} évictions, "
+                f"mises en page {stats['layout_hits']} hits / {stats['layout_misses']} calculs")
+
+
+class GlyphAtlas:
+    """Glyphes d'une police et d'une couleur dans une seule surface ; un texte = une suite de blits"""
+    def __init__(self, font, color, charset=GLYPH_CHARSET, premultiplied=False):
+        self.font = font
+        self.color = color
+        self.premultiplied = premultiplied
+        self.height = font.get_height()
+        self.rects = {}
+        self.extra = {}  # Caractères hors du jeu de base, rendus au premier usage
+
+        glyphs = [(char, font.render(char, True, color)) for char in dict.fromkeys(charset)]
+        width = sum(glyph.get_width() for _, glyph in glyphs)
+        self.surface = new_surface((max(width, 1), self.height), alpha=True)
+        self.surface.fill((0, 0, 0, 0))
+        x = 0
+        for char, glyph in glyphs:
+            # BLEND_RGBA_ADD sur un fond nul copie les pixels sans prémultiplier l'alpha
+            self.surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            self.rects[char] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+        if premultiplied:
+            self.surface = self.surface.premul_alpha()
+        self.blit_flags = pygame.BLEND_PREMULTIPLIED if premultiplied else 0
+
+    def glyph(self, char):
+        """(surface, zone source) du caractère"""
+        rect = self.rects.get(char)
+        if rect is not None:
+            return self.surface, rect
+        glyph = self.extra.get(char)
+        if glyph is None:
+            glyph = ingest(self.font.render(char, True, self.color), alpha=True)
+            if self.premultiplied:
+                glyph = glyph.convert_alpha().premul_alpha()
+            self.extra[char] = glyph
+        return glyph, glyph.get_rect()
+
+    def size(self, text):
+        return sum(self.glyph(char)[1].width for char in text), self.height
+
+    def draw(self, target, text, pos):
+        """Blitte le texte glyphe par glyphe, sans créer de surface ; retourne la zone couverte"""
+        x, y = pos
+        for char in text:
+            surface, area = self.glyph(char)
+            target.blit(surface, (x, y), area, special_flags=self.blit_flags)
+            x += area.width
+        glyph_text.blits += len(text)
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)
+
+
+class GlyphText:
+    """Atlas de glyphes partagés par (police, couleur, prémultiplié)"""
+    def __init__(self):
+        self.atlases = {}
+        self.blits = 0
+
+    def get(self, font, color, premultiplied=False):
+        key = (font_registry.key(font), tuple(color), premultiplied)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(font, color, premultiplied=premultiplied)
+            self.atlases[key] = atlas
+        return atlas
+
+    def get_stats(self):
+        return {'atlases': len(self.atlases), 'blits': self.blits}
+
+
+font_registry = FontRegistry()
+text_cache = TextCache()
+glyph_text = GlyphText()
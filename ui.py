@@ -1,29 +1,66 @@
 import pygame
 from constants import WHITE
+from text import font_registry, text_cache
+
+
+class Label:
+    """Texte pré-rendu, centré ; rendu de nouveau seulement si le texte ou la couleur change"""
+    def __init__(self, text, font, color, center):
+        self.font = font
+        self.center = center
+        self.text = None
+        self.color = color
+        self.set_text(text, color)
+
+    def set_text(self, text, color=None):
+        color = color or self.color
+        if text == self.text and color == self.color:
+            return
+        self.text = text
+        self.color = color
+        self.surface = text_cache.render(self.font, text, color)
+        self.rect = self.surface.get_rect(center=self.center)
+
+    def draw(self, screen):
+        screen.blit(self.surface, self.rect)
+        return self.rect
+
 
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color, scale=1.0):
         self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
+        self.text = None
         self.color = color
         self.hover_color = hover_color
         self.current_color = color
-        self.font = pygame.font.Font(None, int(40 * scale))
-    
+        self.hovered = False
+        self.font = font_registry.get(None, int(40 * scale))
+        self.set_text(text)
+
+    def set_text(self, text):
+        """Le libellé est rendu une fois, puis seulement quand il change"""
+        if text == self.text:
+            return
+        self.text = text
+        self.text_surf = text_cache.render(self.font, text, WHITE)
+        self.text_rect = self.text_surf.get_rect(center=self.rect.center)
+
+    def set_colors(self, color, hover_color):
+        self.color = color
+        self.hover_color = hover_color
+        self.current_color = hover_color if self.hovered else color
+
     def draw(self, screen):
+        """Dessine le bouton ; retourne la zone couverte (le texte peut dépasser du cadre)"""
         pygame.draw.rect(screen, self.current_color, self.rect, border_radius=10)
         pygame.draw.rect(screen, WHITE, self.rect, 3, border_radius=10)
-        text_surf = self.font.render(self.text, True, WHITE)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        screen.blit(text_surf, text_rect)
-    
+        screen.blit(self.text_surf, self.text_rect)
+        return self.rect.union(self.text_rect)
+
     def check_hover(self, mouse_pos):
-        if self.rect.collidepoint(mouse_pos):
-            self.current_color = self.hover_color
-            return True
-        else:
-            self.current_color = self.color
-            return False
-    
+        self.hovered = self.rect.collidepoint(mouse_pos)
+        self.current_color = self.hover_color if self.hovered else self.color
+        return self.hovered
+
     def is_clicked(self, mouse_pos, mouse_pressed):
         return self.rect.collidepoint(mouse_pos) and mouse_pressed[0]
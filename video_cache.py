@@ -0,0 +1,243 @@
+import mmap
+import os
+import struct
+import threading
+import time
+import cv2
+import numpy as np
+import pygame
+from asset_cache import CACHE_VERSION, display_pixel_format, source_digest
+from constants import VIDEO_CACHE_MAX_MB
+from video_stream import FrameConverter, VideoStream
+
+# Fichier de frames brutes, une par résolution d'écran:
+#   en-tête | index (position de chaque frame, uint64) | frames au format de l'écran, alignées sur une page
+# Relu par mmap: les frames sont blittées depuis le cache de pages du système, sans décodage,
+# et les pages sont partagées entre plusieurs processus du jeu sur la même machine.
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '.cache', 'videos')
+HEADER = struct.Struct('<4sHHHI4sdQ')  # magic, version, largeur, hauteur, frames, format des pixels, fps, début des frames
+INDEX = struct.Struct('<Q')
+MAGIC = b'AVVF'
+TMP_MAX_AGE = 3600  # Fichier temporaire plus ancien (transcodage interrompu par un plantage): supprimé par prune
+
+# Arrêt des transcodages en cours à la fermeture du jeu
+stop_event = threading.Event()
+
+
+def cache_path(path, size):
+    """Fichier de frames pour (vidéo source, taille) ; OSError si la source n'existe pas"""
+    digest = source_digest(path, f"{size[0]}x{size[1]}")
+    return os.path.join(CACHE_DIR, f"v{CACHE_VERSION}", f"{size[0]}x{size[1]}", digest + '.frames')
+
+
+class VideoFile:
+    """Frames brutes projetées en mémoire (lecture seule) ; aucune Surface créée ici: utilisable sur un thread"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, width, height, frame_count, pixel_format, fps, data_offset = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != CACHE_VERSION or frame_count == 0:
+            self.map.close()
+            raise ValueError(f"{path}: fichier de frames invalide")
+        self.size = (width, height)
+        self.frame_count = frame_count
+        self.pixel_format = pixel_format.decode('ascii')
+        self.fps = fps
+        self.frame_bytes = width * height * 4
+        self.offsets = [INDEX.unpack_from(self.map, HEADER.size + i * INDEX.size)[0] for i in range(frame_count)]
+        if self.offsets[-1] + self.frame_bytes > len(self.map):
+            self.map.close()
+            raise ValueError(f"{path}: fichier de frames tronqué")
+        self.view = memoryview(self.map)
+
+    def frame(self, index):
+        """Pixels de la frame, sans copie (vue sur le fichier)"""
+        offset = self.offsets[index]
+        return self.view[offset:offset + self.frame_bytes]
+
+    def close(self):
+        self.view.release()
+        self.map.close()
+
+
+def open_video(path, size):
+    """Frames déjà transcodées pour cette taille et ce format d'écran, ou None"""
+    try:
+        file_path = cache_path(path, size)
+        video = VideoFile(file_path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if video.pixel_format != display_pixel_format():
+        video.close()
+        return None
+    try:
+        os.utime(file_path)  # Date d'utilisation: prune supprime d'abord les fichiers oubliés
+    except OSError:
+        pass
+    return video
+
+
+def transcode(path, size):
+    """Décode une fois la vidéo, recadrée et redimensionnée à `size`, dans un fichier de frames brutes.
+    Retourne le VideoFile écrit, ou None (déjà en cache, source illisible, trop gros ou jeu fermé)"""
+    try:
+        out_path = cache_path(path, size)
+    except OSError:
+        return None  # Source absente: la lecture normale affiche l'avertissement
+    if open_video(path, size) is not None:
+        return None
+
+    video = cv2.VideoCapture(path)
+    if not video.isOpened():
+        return None
+    width, height = size
+    frame_count = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    # Début des frames aligné sur une page ; le compte annoncé par le conteneur peut être faux:
+    # l'index est réservé pour ce compte et l'en-tête réécrit avec le nombre réellement décodé
+    data_offset = -(-(HEADER.size + frame_count * INDEX.size) // mmap.PAGESIZE) * mmap.PAGESIZE
+    frame_size = -(-width * height * 4 // mmap.PAGESIZE) * mmap.PAGESIZE
+    budget = VIDEO_CACHE_MAX_MB * 1024 * 1024
+    if frame_count <= 0 or data_offset + frame_count * frame_size > budget:
+        print(f"Warning: {path} trop longue pour le cache de frames ({frame_count} frames en {width}x{height})")
+        video.release()
+        return None
+    prune(budget - data_offset - frame_count * frame_size)
+
+    fps = video.get(cv2.CAP_PROP_FPS)
+    fps = fps if fps and fps > 0 else 30.0
+    pixel_format = display_pixel_format()
+    converter = FrameConverter(size, pixel_format)
+    buffer = np.empty((height, width, 4), dtype=np.uint8)
+    written = 0
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = f"{out_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    print(f"Préparation de la vidéo {os.path.basename(path)} en {width}x{height}...")
+    try:
+        with open(tmp_path, 'wb') as f:
+            while written < frame_count and not stop_event.is_set():
+                ret, frame = video.read()
+                if not ret:
+                    break
+                converter.convert(frame, buffer)
+                f.seek(data_offset + written * frame_size)
+                f.write(buffer.data)
+                written += 1
+            if stop_event.is_set() or written == 0:
+                raise InterruptedError
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, CACHE_VERSION, width, height, written, pixel_format.encode('ascii'),
+                                fps, data_offset))
+            f.write(b''.join(INDEX.pack(data_offset + i * frame_size) for i in range(written)))
+        os.replace(tmp_path, out_path)
+    except (OSError, InterruptedError) as e:
+        if not isinstance(e, InterruptedError):
+            print(f"Warning: cache de frames impossible pour {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+    finally:
+        video.release()
+    return open_video(path, size)
+
+
+def prune(budget_bytes):
+    """Supprime les fichiers de frames les moins récemment utilisés (autres résolutions, sources modifiées,
+    anciennes versions) jusqu'à ce que le dossier tienne dans `budget_bytes`"""
+    files = []
+    now = time.time()
+    for root, _, names in os.walk(CACHE_DIR):
+        for name in names:
+            file_path = os.path.join(root, name)
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            if name.endswith('.tmp') and now - stat.st_mtime < TMP_MAX_AGE:
+                continue  # Transcodage en cours dans un autre processus
+            files.append((stat.st_mtime, stat.st_size, file_path))
+    total = sum(size for _, size, _ in files)
+    for _, size, file_path in sorted(files):
+        if total <= budget_bytes:
+            break
+        try:
+            # Un processus qui a déjà projeté le fichier garde ses pages jusqu'à la fermeture
+            os.remove(file_path)
+            total -= size
+        except OSError:
+            pass
+
+
+def cancel():
+    """Interrompt les transcodages en cours (fermeture du jeu)"""
+    stop_event.set()
+
+
+class MappedVideo:
+    """Lecture d'un fichier de frames: même interface que VideoStream, sans thread ni décodage.
+    Chaque frame est enveloppée une fois par une Surface qui lit directement les pages du fichier"""
+    def __init__(self, video, start_position=0):
+        self.video = video
+        self.size = video.size
+        self.fps = video.fps
+        self.frame_step = 1
+        self.surfaces = [None] * video.frame_count
+        self.start_position = start_position % video.frame_count
+        self.current_position = self.start_position
+        self.start_time = None
+        self.shown = 0
+
+    def start(self):
+        pass  # Rien à lancer: les frames sont déjà prêtes
+
+    def stop(self):
+        self.start_position = self.current_position
+        self.start_time = None
+
+    def get_frame(self):
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = now
+        position = self.start_position + int((now - self.start_time) * self.fps)
+        position -= position % self.frame_step  # Paliers de qualité: même cadence d'images que VideoStream
+        index = position % self.video.frame_count
+        if index != self.current_position:
+            self.shown += 1
+        self.current_position = index
+
+        surface = self.surfaces[index]
+        if surface is None:
+            surface = pygame.image.frombuffer(self.video.frame(index), self.size, self.video.pixel_format)
+            surface.set_alpha(None)
+            self.surfaces[index] = surface
+        return surface
+
+    def get_stats(self):
+        return {
+            'fps': self.fps,
+            'frames': self.video.frame_count,
+            'shown': self.shown,
+            'mapped_mb': len(self.video.map) / (1024 * 1024)
+        }
+
+
+def make_stream(path, size, video=None):
+    """Lecteur pour cette vidéo: frames en cache (open_video) si disponibles, sinon décodage sur un thread"""
+    if video is not None:
+        return MappedVideo(video)
+    return VideoStream(path, size)
+
+
+def use_cached(stream, video):
+    """Lecteur du fichier de frames tout juste écrit par transcode, repris à la frame affichée par `stream`
+    (inchangé si rien n'a été écrit)"""
+    if video is None:
+        return stream
+    position = 0
+    if stream is not None:
+        position = stream.current_position
+        stream.stop()
+    return MappedVideo(video, position)
@@ -0,0 +1,225 @@
+import threading
+import time
+from collections import deque
+import cv2
+import numpy as np
+import pygame
+from asset_cache import display_pixel_format
+from asset_registry import asset_registry
+from constants import VIDEO_BUFFER_FRAMES
+
+
+def cover_region(video_size, size):
+    """Zone source (x, y, largeur, hauteur) qui, agrandie à `size`, couvre l'écran (recadrage centré)"""
+    video_width, video_height = video_size
+    width, height = size
+    scale = max(width / video_width, height / video_height)
+    crop_width = min(video_width, round(width / scale))
+    crop_height = min(video_height, round(height / scale))
+    return (video_width - crop_width) // 2, (video_height - crop_height) // 2, crop_width, crop_height
+
+
+class FrameConverter:
+    """Recadre, convertit au format de l'écran et redimensionne les frames d'un clip, sans allocation par frame"""
+    def __init__(self, size, pixel_format):
+        self.size = size
+        self.convert_code = cv2.COLOR_BGR2BGRA if pixel_format == 'BGRA' else cv2.COLOR_BGR2RGBA
+        self.crop = None
+        self.source = None  # Zone recadrée convertie (taille de la source, allouée à la première frame)
+
+    def convert(self, frame, dst):
+        # Conversion sur la zone recadrée (la plus petite image), puis redimensionnement directement dans dst
+        if self.crop is None:
+            self.crop = cover_region((frame.shape[1], frame.shape[0]), self.size)
+            self.source = np.empty((self.crop[3], self.crop[2], 4), dtype=np.uint8)
+        x, y, width, height = self.crop
+        cv2.cvtColor(frame[y:y + height, x:x + width], self.convert_code, dst=self.source)
+        cv2.resize(self.source, self.size, dst=dst, interpolation=cv2.INTER_LINEAR)
+
+
+class VideoStream:
+    """Vidéo décodée sur un thread dans un tampon circulaire de quelques frames ;
+    la lecture boucle et suit le FPS réel du clip, quelle que soit la cadence du jeu.
+    Chaque emplacement est déjà au format de l'écran et partagé avec sa Surface: afficher une frame = un blit"""
+    def __init__(self, path, size, capacity=VIDEO_BUFFER_FRAMES):
+        self.path = path
+        self.size = size
+        self.capacity = capacity
+        self.frame_step = 1  # Une frame décodée sur frame_step (les autres sont sautées sans conversion)
+        self.fps = 30.0
+        self.failed = False
+
+        # Emplacements dans l'ordre des octets de l'écran, alloués par le thread une fois le fichier ouvert
+        # (rien n'est réservé pour une vidéo absente) ; chacun est enveloppé une fois par une Surface
+        # au premier affichage (frombuffer: aucune copie ; alpha ignoré, le blit est une simple copie)
+        self.pixel_format = display_pixel_format()
+        self.converter = FrameConverter(size, self.pixel_format)
+        self.slots = None
+        self.surfaces = [None] * capacity
+        self.registered = False  # Emplacements comptés dans l'asset_registry (thread principal)
+        self.free = deque(range(capacity))
+        self.ready = deque()
+        self.current = None
+        self.current_position = 0
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+
+        self.start_time = None
+        self.registry_key = ('video_stream', path, tuple(size))
+        self.decoded = 0
+        self.dropped = 0
+
+    def start(self):
+        """Lance le décodage ; l'ouverture du fichier se fait aussi sur le thread (démarrage immédiat)"""
+        if self.running or self.failed:
+            return
+        if self.thread is not None:
+            if self.thread.is_alive():
+                return  # L'ancien décodeur n'est pas encore sorti (lecture bloquée): nouvel essai à la prochaine frame
+            self.thread = None
+
+        # Frames décodées avant l'arrêt rendues au décodeur: la lecture reprend à la frame affichée
+        with self.condition:
+            self.free.extend(slot for _, slot in self.ready)
+            self.ready.clear()
+        self.running = True
+        self.thread = threading.Thread(target=self.decode_loop, name='video-stream', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join(timeout=1)
+        if not self.thread.is_alive():
+            self.thread = None  # Sinon start() attend sa sortie: deux décodeurs partageraient les emplacements
+        asset_registry.remove(self.registry_key)
+        self.registered = False
+        with self.condition:
+            self.start_time = None
+
+    def decode_loop(self):
+        video = cv2.VideoCapture(self.path)
+        if not video.isOpened():
+            print(f"Warning: Could not load background video {self.path}")
+            self.failed = True
+            return
+        fps = video.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and fps > 0 else 30.0
+        if self.slots is None:
+            width, height = self.size
+            self.slots = [np.empty((height, width, 4), dtype=np.uint8) for _ in range(self.capacity)]
+
+        # Redémarrage: reprendre à la frame affichée (les positions comptent les frames depuis le début)
+        position = self.current_position
+        frame_count = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        if position and frame_count > 0:
+            video.set(cv2.CAP_PROP_POS_FRAMES, position % frame_count)
+
+        while True:
+            # Attendre un emplacement libre (tampon plein = le décodeur a de l'avance)
+            with self.condition:
+                while self.running and not self.free:
+                    self.condition.wait()
+                if not self.running:
+                    break
+                slot = self.free.popleft()
+
+            ret, frame = video.read()
+            if not ret:
+                # Fin du clip: on reprend au début sans trou dans la lecture
+                video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, frame = video.read()
+                if not ret:
+                    print(f"Warning: lecture de la vidéo {self.path} impossible")
+                    self.failed = True
+                    break
+
+            self.converter.convert(frame, self.slots[slot])
+
+            with self.condition:
+                self.ready.append((position, slot))
+            self.decoded += 1
+
+            # Paliers de qualité légers: frames intermédiaires sautées sans décodage complet
+            position += 1
+            for _ in range(self.frame_step - 1):
+                if not video.grab():
+                    video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                position += 1
+
+        video.release()
+
+    def get_frame(self):
+        """Frame à afficher maintenant (None tant que la première n'est pas prête, ou si la vidéo est illisible)"""
+        if self.failed:
+            self.release()
+            return None
+        if self.slots is not None and not self.registered:
+            asset_registry.put(self.registry_key, 'video', self.slots, nbytes=sum(slot.nbytes for slot in self.slots))
+            self.registered = True
+        now = time.perf_counter()
+        changed = None
+        with self.condition:
+            if self.start_time is None:
+                if not self.ready:
+                    # Redémarrage: la frame affichée reste valide en attendant la suivante
+                    return self.current_surface()
+                self.start_time = now - self.ready[0][0] / self.fps
+            target = (now - self.start_time) * self.fps
+
+            # Prendre la frame la plus récente dont l'heure est passée ; les plus anciennes sont rendues au décodeur
+            while self.ready and self.ready[0][0] <= target:
+                position, slot = self.ready.popleft()
+                if changed is not None:
+                    self.free.append(changed)
+                    self.dropped += 1
+                changed = slot
+                self.current_position = position
+            if changed is not None:
+                if self.current is not None:
+                    self.free.append(self.current)
+                self.current = changed
+                self.condition.notify()
+
+            # Très en retard (pause, décodeur trop lent): reprendre à la frame courante plutôt que sauter
+            if not self.ready and target - self.current_position > self.capacity * self.frame_step:
+                self.start_time = now - self.current_position / self.fps
+
+        # Le décodeur n'écrit jamais dans l'emplacement affiché: sa Surface reste valide jusqu'au prochain appel
+        return self.current_surface()
+
+    def current_surface(self):
+        if self.current is None:
+            return None
+        surface = self.surfaces[self.current]
+        if surface is None:
+            surface = pygame.image.frombuffer(self.slots[self.current], self.size, self.pixel_format)
+            surface.set_alpha(None)
+            self.surfaces[self.current] = surface
+        return surface
+
+    def release(self):
+        """Vidéo illisible: libère les emplacements et leur place dans le registre (thread principal)"""
+        if self.slots is None and not self.registered:
+            return
+        asset_registry.remove(self.registry_key)
+        self.registered = False
+        self.slots = None
+        self.surfaces = [None] * self.capacity
+        self.converter = FrameConverter(self.size, self.pixel_format)
+        self.current = None
+        with self.condition:
+            self.free = deque(range(self.capacity))
+            self.ready.clear()
+
+    def get_stats(self):
+        return {
+            'fps': self.fps,
+            'buffered': len(self.ready),
+            'decoded': self.decoded,
+            'dropped': self.dropped
+        }
@@ -0,0 +1,10 @@
+class WorldChunk:
+    """Tronçon du monde: une tranche de fond et la liste des ennemis qui y apparaissent"""
+    def __init__(self, index, x, width, bg_path=None):
+        self.index = index
+        self.x = x
+        self.width = width
+        self.bg_path = bg_path
+        # Ennemis en sommeil: (x, type, points de vie ou None) ; vidée quand le tronçon devient actif
+        self.spawns = []
+        self.active = False